@@ -7,11 +7,16 @@
 import sys
 import os
 import io
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
-# 设置标准输出为UTF-8编码
+# 设置标准输出为UTF-8编码（原地切换编码，无需重新包装流）
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except AttributeError:
+        pass
 
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -19,125 +24,107 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.config.settings import settings
 
 
-def check_accounts():
-    """检查账户配置"""
-    print("=" * 60)
-    print("1. 检查账户配置")
-    print("=" * 60)
+def check_accounts(out=None):
+    """
+    检查账户配置
+
+    Args:
+        out: 输出流，默认为标准输出
+    """
+    print("=" * 60, file=out)
+    print("1. 检查账户配置", file=out)
+    print("=" * 60, file=out)
+    
+    # 字段校验已在Settings构造时完成，这里只报告结果
+    if settings.ACCOUNT_ERRORS:
+        for error in settings.ACCOUNT_ERRORS:
+            print(f"❌ {error}", file=out)
+        print("   请在 src/config/settings.py 中修正账户配置", file=out)
+        return False
     
     if not settings.ACCOUNTS:
-        print("❌ 错误：ACCOUNTS列表为空")
-        print("   请在 src/config/settings.py 中配置至少一个账户")
+        print("❌ 错误：ACCOUNTS列表为空", file=out)
+        print("   请在 src/config/settings.py 中配置至少一个账户", file=out)
         return False
     
-    print(f"✅ 发现 {len(settings.ACCOUNTS)} 个账户配置")
+    print(f"✅ 发现 {len(settings.ACCOUNTS)} 个账户配置", file=out)
     
     for i, account in enumerate(settings.ACCOUNTS, 1):
-        print(f"\n账户 {i}: {account.get('account_name', 'Unknown')}")
-        
-        # 检查必填字段
-        required_fields = ['username', 'password', 'account_name', 
-                          'seat_numbers', 'profile_dir']
-        all_ok = True
-        
-        for field in required_fields:
-            if field not in account:
-                print(f"  ❌ 缺少字段: {field}")
-                all_ok = False
-                continue
-            
-            value = account[field]
-            
-            # 检查是否为空
-            if not value:
-                print(f"  ❌ {field} 未填写")
-                all_ok = False
-            elif field == 'username' and not str(value).strip():
-                print(f"  ❌ {field} 为空字符串")
-                all_ok = False
-            elif field == 'password' and not str(value).strip():
-                print(f"  ❌ {field} 为空字符串")
-                all_ok = False
-            elif field == 'seat_numbers' and not isinstance(value, list):
-                print(f"  ❌ {field} 必须是列表")
-                all_ok = False
-            elif field == 'seat_numbers' and len(value) == 0:
-                print(f"  ❌ {field} 列表为空")
-                all_ok = False
-            else:
-                # 显示配置信息（密码隐藏）
-                if field == 'password':
-                    display_value = '*' * len(str(value))
-                elif field == 'seat_numbers':
-                    display_value = f"{value} (共{len(value)}个座位)"
-                else:
-                    display_value = value
-                print(f"  ✅ {field}: {display_value}")
-        
-        if not all_ok:
-            return False
-    
-    # 检查profile_dir是否重复
-    profile_dirs = [acc['profile_dir'] for acc in settings.ACCOUNTS 
-                   if 'profile_dir' in acc]
-    if len(profile_dirs) != len(set(profile_dirs)):
-        print("\n❌ 错误：多个账户使用了相同的profile_dir")
-        print("   每个账户必须使用不同的profile_dir")
-        return False
+        print(f"\n账户 {i}: {account.account_name}", file=out)
+        print(f"  ✅ username: {account.username}", file=out)
+        print(f"  ✅ password: {'*' * len(account.password)}", file=out)
+        print(f"  ✅ seat_numbers: {list(account.seat_numbers)} "
+              f"(共{len(account.seat_numbers)}个座位)", file=out)
+        print(f"  ✅ profile_dir: {account.profile_dir}", file=out)
     
-    print("\n✅ 账户配置检查通过")
+    print("\n✅ 账户配置检查通过", file=out)
     return True
 
 
-def check_target_room():
-    """检查目标房间配置"""
-    print("\n" + "=" * 60)
-    print("2. 检查目标房间配置")
-    print("=" * 60)
+def check_target_room(out=None):
+    """
+    检查目标房间配置
+
+    Args:
+        out: 输出流，默认为标准输出
+    """
+    print("\n" + "=" * 60, file=out)
+    print("2. 检查目标房间配置", file=out)
+    print("=" * 60, file=out)
     
     if not settings.TARGET_ROOM:
-        print("❌ 错误：TARGET_ROOM 未配置")
+        print("❌ 错误：TARGET_ROOM 未配置", file=out)
         return False
     
-    print(f"✅ 目标房间: {settings.TARGET_ROOM}")
+    print(f"✅ 目标房间: {settings.TARGET_ROOM}", file=out)
     return True
 
 
-def check_wechat_config():
-    """检查微信通知配置"""
-    print("\n" + "=" * 60)
-    print("3. 检查微信通知配置")
-    print("=" * 60)
+def check_wechat_config(out=None):
+    """
+    检查微信通知配置
+
+    Args:
+        out: 输出流，默认为标准输出
+    """
+    print("\n" + "=" * 60, file=out)
+    print("3. 检查微信通知配置", file=out)
+    print("=" * 60, file=out)
     
     if not settings.WECHAT_WORK_ENABLED:
-        print("ℹ️  微信通知未启用")
+        print("ℹ️  微信通知未启用", file=out)
         return True
     
-    print("✅ 微信通知已启用")
+    print("✅ 微信通知已启用", file=out)
     
     if not settings.WECHAT_WORK_WEBHOOK_URL:
-        print("❌ 错误：WECHAT_WORK_WEBHOOK_URL 未配置")
-        print("   请填写企业微信机器人的Webhook URL")
+        print("❌ 错误：WECHAT_WORK_WEBHOOK_URL 未配置", file=out)
+        print("   请填写企业微信机器人的Webhook URL", file=out)
         return False
     
     if not settings.WECHAT_WORK_WEBHOOK_URL.startswith('https://'):
-        print("❌ 错误：WECHAT_WORK_WEBHOOK_URL 格式不正确")
-        print("   应该以 https:// 开头")
+        print("❌ 错误：WECHAT_WORK_WEBHOOK_URL 格式不正确", file=out)
+        print("   应该以 https:// 开头", file=out)
         return False
     
-    print(f"✅ Webhook URL: {settings.WECHAT_WORK_WEBHOOK_URL[:50]}...")
-    print(f"✅ @所有人: {settings.WECHAT_WORK_MENTION_ALL}")
-    print(f"✅ 成功通知: {settings.NOTIFY_ON_SUCCESS}")
-    print(f"✅ 失败通知: {settings.NOTIFY_ON_FAILURE}")
+    print(f"✅ Webhook URL: {settings.WECHAT_WORK_WEBHOOK_URL[:50]}...", file=out)
+    print(f"✅ @所有人: {settings.WECHAT_WORK_MENTION_ALL}", file=out)
+    print(f"✅ 成功通知: {settings.NOTIFY_ON_SUCCESS}", file=out)
+    print(f"✅ 失败通知: {settings.NOTIFY_ON_FAILURE}", file=out)
     
     return True
 
 
-def check_directories():
-    """检查必要的目录是否存在"""
-    print("\n" + "=" * 60)
-    print("4. 检查目录结构")
-    print("=" * 60)
+def check_directories(out=None):
+    """
+    检查必要的目录是否存在
+
+    Args:
+        out: 输出流，默认为标准输出
+    """
+    print("\n" + "=" * 60, file=out)
+    print("4. 检查目录结构", file=out)
+    print("=" * 60, file=out)
     
     dirs = [
         ('logs', settings.LOG_DIR),
@@ -147,41 +134,51 @@ def check_directories():
     all_ok = True
     for name, path in dirs:
         if os.path.exists(path):
-            print(f"✅ {name} 目录存在: {path}")
+            print(f"✅ {name} 目录存在: {path}", file=out)
         else:
-            print(f"⚠️  {name} 目录不存在，将自动创建: {path}")
+            print(f"⚠️  {name} 目录不存在，将自动创建: {path}", file=out)
             try:
                 os.makedirs(path, exist_ok=True)
-                print(f"   ✅ 已创建目录")
+                print(f"   ✅ 已创建目录", file=out)
             except Exception as e:
-                print(f"   ❌ 创建失败: {e}")
+                print(f"   ❌ 创建失败: {e}", file=out)
                 all_ok = False
     
     return all_ok
 
 
-def check_python_version():
-    """检查Python版本"""
-    print("\n" + "=" * 60)
-    print("5. 检查Python版本")
-    print("=" * 60)
+def check_python_version(out=None):
+    """
+    检查Python版本
+
+    Args:
+        out: 输出流，默认为标准输出
+    """
+    print("\n" + "=" * 60, file=out)
+    print("5. 检查Python版本", file=out)
+    print("=" * 60, file=out)
     
     version = sys.version_info
-    print(f"Python版本: {version.major}.{version.minor}.{version.micro}")
+    print(f"Python版本: {version.major}.{version.minor}.{version.micro}", file=out)
     
     if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print("❌ Python版本过低，需要3.8或更高版本")
+        print("❌ Python版本过低，需要3.8或更高版本", file=out)
         return False
     
-    print("✅ Python版本符合要求")
+    print("✅ Python版本符合要求", file=out)
     return True
 
 
-def check_dependencies():
-    """检查依赖包"""
-    print("\n" + "=" * 60)
-    print("6. 检查依赖包")
-    print("=" * 60)
+def check_dependencies(out=None):
+    """
+    检查依赖包
+
+    Args:
+        out: 输出流，默认为标准输出
+    """
+    print("\n" + "=" * 60, file=out)
+    print("6. 检查依赖包", file=out)
+    print("=" * 60, file=out)
     
     required_packages = [
         'selenium',
@@ -192,16 +189,16 @@ def check_dependencies():
     
     all_ok = True
     for package in required_packages:
-        try:
-            __import__(package)
-            print(f"✅ {package} 已安装")
-        except ImportError:
-            print(f"❌ {package} 未安装")
+        # 仅查找模块规格，不执行包本身（避免加载onnxruntime等重量级依赖）
+        if importlib.util.find_spec(package) is not None:
+            print(f"✅ {package} 已安装", file=out)
+        else:
+            print(f"❌ {package} 未安装", file=out)
             all_ok = False
     
     if not all_ok:
-        print("\n💡 请运行以下命令安装依赖:")
-        print("   pip install -r requirements.txt")
+        print("\n💡 请运行以下命令安装依赖:", file=out)
+        print("   pip install -r requirements.txt", file=out)
         return False
     
     return True
@@ -209,10 +206,12 @@ def check_dependencies():
 
 def main():
     """主函数"""
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 15 + "配置检查工具" + " " * 15 + "║")
-    print("╚" + "=" * 58 + "╝")
-    print()
+    # 全部输出先写入缓冲区，最后一次性写到控制台
+    report = io.StringIO()
+    print("╔" + "=" * 58 + "╗", file=report)
+    print("║" + " " * 15 + "配置检查工具" + " " * 15 + "║", file=report)
+    print("╚" + "=" * 58 + "╝", file=report)
+    print(file=report)
     
     checks = [
         ("Python版本", check_python_version),
@@ -223,42 +222,53 @@ def main():
         ("目录结构", check_directories),
     ]
     
+    # 各项检查互不依赖，并行执行；每项输出写入独立缓冲区，按原顺序打印
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = []
+        for name, check_func in checks:
+            buffer = io.StringIO()
+            futures.append((name, buffer, executor.submit(check_func, buffer)))
+
     results = []
-    for name, check_func in checks:
+    for name, buffer, future in futures:
         try:
-            result = check_func()
-            results.append((name, result))
+            result = future.result()
         except Exception as e:
-            print(f"\n❌ 检查 {name} 时出错: {e}")
-            results.append((name, False))
+            print(f"\n❌ 检查 {name} 时出错: {e}", file=buffer)
+            result = False
+        report.write(buffer.getvalue())
+        results.append((name, result))
     
     # 显示总结
-    print("\n" + "=" * 60)
-    print("检查结果汇总")
-    print("=" * 60)
+    print("\n" + "=" * 60, file=report)
+    print("检查结果汇总", file=report)
+    print("=" * 60, file=report)
     
     passed = sum(1 for _, result in results if result)
     total = len(results)
     
     for name, result in results:
         status = "✅ 通过" if result else "❌ 失败"
-        print(f"{name:20s} {status}")
+        print(f"{name:20s} {status}", file=report)
     
-    print("\n" + "=" * 60)
+    print("\n" + "=" * 60, file=report)
     
     if passed == total:
-        print("🎉 所有检查通过！可以运行程序了")
-        print("\n运行方式:")
-        print("  1. 双击运行 run.bat")
-        print("  2. 或在命令行运行: python main.py")
-        return 0
+        print("🎉 所有检查通过！可以运行程序了", file=report)
+        print("\n运行方式:", file=report)
+        print("  1. 双击运行 run.bat", file=report)
+        print("  2. 或在命令行运行: python main.py", file=report)
+        exit_code = 0
     else:
-        print(f"⚠️  {total - passed}/{total} 项检查失败，请修复后再运行")
-        print("\n💡 查看详细配置说明:")
-        print("  - QUICKSTART.md (快速开始)")
-        print("  - CONFIG_EXAMPLE.md (配置示例)")
-        print("  - README.md (完整文档)")
-        return 1
+        print(f"⚠️  {total - passed}/{total} 项检查失败，请修复后再运行", file=report)
+        print("\n💡 查看详细配置说明:", file=report)
+        print("  - QUICKSTART.md (快速开始)", file=report)
+        print("  - CONFIG_EXAMPLE.md (配置示例)", file=report)
+        print("  - README.md (完整文档)", file=report)
+        exit_code = 1
+    
+    sys.stdout.write(report.getvalue())
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 座位预约系统 Selenium V2 - 主入口
 
 功能：
-1. 双账户并行预约
+1. 双账户并行预约（每个账户运行在独立进程中）
 2. 自动处理滑块验证码
 3. 全局超时控制
 4. 错误日志记录
@@ -11,180 +11,334 @@
 
 import threading
 import os
-import asyncio
+import time
 from datetime import datetime
 
-from src.config.settings import settings
-from src.core.browser_manager import create_browser_manager
-from src.core.login_handler import create_login_handler
-from src.core.slider_captcha import create_slider_captcha
-from src.core.reservation_handler import create_reservation_handler
-from src.utils.logger import get_logger
-from src.utils.element_helper import get_element_helper
-from src.utils.date_helper import get_date_helper
-from src.utils.wechat_notification import WeChatWorkNotifier
+from src.config.settings import Account, get_settings
 
 
-# 全局结果存储
-reservation_results = []
-results_lock = threading.Lock()
+# 微信通知共享资源（每个进程一份，事件循环运行在后台守护线程中）
+_notify_loop = None
+_notifier = None
+_notify_lock = threading.Lock()
+
+
+def _run_notify_loop(loop):
+    """后台线程入口：运行事件循环直到被停止"""
+    loop.run_forever()
+    loop.close()
+
+
+def _get_notify_loop():
+    """获取通知专用事件循环（首次调用时创建并启动）"""
+    global _notify_loop
+    import asyncio
+
+    with _notify_lock:
+        if _notify_loop is None:
+            _notify_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_run_notify_loop,
+                args=(_notify_loop,),
+                name="Thread-WeChatNotify",
+                daemon=True
+            ).start()
+        return _notify_loop
+
+
+def get_notifier():
+    """
+    获取共享的微信通知器（未启用时返回None）
+
+    所有账户共用同一个通知器，从而复用其HTTP会话（keep-alive）
+    """
+    global _notifier
+    settings = get_settings()
+    if not (settings.WECHAT_WORK_ENABLED and settings.WECHAT_WORK_WEBHOOK_URL):
+        return None
+
+    from src.utils.wechat_notification import WeChatWorkNotifier
+
+    with _notify_lock:
+        if _notifier is None:
+            _notifier = WeChatWorkNotifier(
+                webhook_url=settings.WECHAT_WORK_WEBHOOK_URL,
+                timeout=settings.WECHAT_WORK_TIMEOUT
+            )
+        return _notifier
 
 
 def send_wechat_sync(notifier, coro):
-    """同步包装器：在新事件循环中运行异步通知"""
+    """同步包装器：将异步通知提交到共享事件循环并等待结果"""
+    import asyncio
+
+    # 通知器给出的最长发送耗时（含频率限制和重试等待），外加少量余量
+    timeout = notifier.max_send_time() + 2
+    future = None
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(coro)
-        loop.close()
-        return result
+        future = asyncio.run_coroutine_threadsafe(coro, _get_notify_loop())
+        return future.result(timeout=timeout)
     except Exception as e:
+        if future is not None:
+            future.cancel()
         print(f"微信通知发送失败: {e}")
         return {'success': False, 'message': str(e)}
 
 
-def run_account(account_config: dict):
+async def send_batched_report(notifier, results, successful, failed, execution_time):
     """
-    单个账户的预约流程
+    将各账户的成功/失败通知与汇总报告合并为一条消息发送
+
+    单账户通知已由子进程即时发送（NOTIFY_PER_ACCOUNT）时只发送汇总报告。
+    """
+    settings = get_settings()
+    if not settings.NOTIFY_PER_ACCOUNT:
+        seats = {account.account_name: list(account.seat_numbers) for account in settings.ACCOUNTS}
+        for result in results:
+            if result['success'] and settings.NOTIFY_ON_SUCCESS:
+                await notifier.queue(notifier.format_success_notification(
+                    seat_number=result['seat_number'],
+                    date=result['date'],
+                    account_name=result['account_name'],
+                    room_name=settings.TARGET_ROOM
+                ))
+            elif not result['success'] and settings.NOTIFY_ON_FAILURE:
+                await notifier.queue(notifier.format_failure_notification(
+                    date=result['date'],
+                    account_name=result['account_name'],
+                    error_message=result['message'],
+                    room_name=settings.TARGET_ROOM,
+                    attempted_seats=seats.get(result['account_name'])
+                ))
+
+    await notifier.queue(notifier.format_dual_account_report(
+        successful=successful,
+        failed=failed,
+        execution_time=execution_time,
+        results=results
+    ))
+    return await notifier.flush_batched(mention_all=settings.WECHAT_WORK_MENTION_ALL)
+
+
+def shutdown_notifications():
+    """关闭共享通知器的HTTP会话并停止事件循环"""
+    global _notify_loop, _notifier
+    with _notify_lock:
+        loop, notifier = _notify_loop, _notifier
+        _notify_loop, _notifier = None, None
+
+    if loop is None:
+        return
+
+    if notifier is not None:
+        send_wechat_sync(notifier, notifier.aclose())
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def run_account(account_config: Account, barrier=None) -> dict:
+    """
+    单个账户的预约流程（在独立子进程中执行）
 
     Args:
-        account_config: 账户配置字典
+        account_config: 账户配置
+        barrier: 跨进程启动屏障（Manager().Barrier），所有账户的浏览器
+            创建完成后再同时开始登录
+
+    Returns:
+        预约结果字典
     """
-    account_name = account_config['account_name']
-    username = account_config['username']
-    password = account_config['password']
-    seat_numbers = account_config['seat_numbers']
-    profile_dir = account_config['profile_dir']
+    from src.utils.logger import get_logger
 
     # 初始化日志
-    logger = get_logger(account_name)
+    logger = get_logger(account_config.account_name)
+    try:
+        return _run_account_flow(account_config, logger, barrier)
+    finally:
+        # 子进程退出时不执行atexit，在此写出队列中尚未处理的日志
+        logger.flush()
+
+
+def _run_account_flow(account_config: Account, logger, barrier=None) -> dict:
+    """
+    执行单个账户的浏览器、登录和预约流程
+
+    Args:
+        account_config: 账户配置
+        logger: 账户日志记录器
+        barrier: 跨进程启动屏障
+
+    Returns:
+        预约结果字典
+    """
+    # 重量级模块（selenium/ddddocr/aiohttp）延迟到子进程内导入
+    from src.core.browser_manager import create_browser_manager
+    from src.core.login_handler import create_login_handler
+    from src.core.slider_captcha import create_slider_captcha
+    from src.core.reservation_handler import create_reservation_handler
+    from src.utils.element_helper import get_element_helper
+    from src.utils.date_helper import get_date_helper
+
+    settings = get_settings()
+    account_name = account_config.account_name
+    username = account_config.username
+    password = account_config.password
+    seat_numbers = list(account_config.seat_numbers)
+    profile_dir = account_config.profile_dir
     
-    # 初始化微信通知器
-    notifier = None
-    if settings.WECHAT_WORK_ENABLED and settings.WECHAT_WORK_WEBHOOK_URL:
-        notifier = WeChatWorkNotifier(
-            webhook_url=settings.WECHAT_WORK_WEBHOOK_URL,
-            timeout=settings.WECHAT_WORK_TIMEOUT
-        )
+    # 默认只在全部账户结束后发送一条汇总报告，单账户通知需显式开启
+    notifier = get_notifier() if settings.NOTIFY_PER_ACCOUNT else None
 
     # 初始化浏览器管理器（传入账户名用于设置窗口位置）
     browser_manager = create_browser_manager(profile_dir, account_name)
 
     # 创建浏览器实例
-    driver = browser_manager.create_driver()
-
-    # 初始化各个模块
-    element_helper = get_element_helper(driver)
-    date_helper = get_date_helper()
-    slider_captcha = create_slider_captcha(driver, logger)
-    login_handler = create_login_handler(driver, element_helper, logger)
-    reservation_handler = create_reservation_handler(
-        driver,
-        element_helper,
-        date_helper,
-        slider_captcha,
-        logger
-    )
-    
-    # 记录结果
-    tomorrow_info = date_helper.get_tomorrow_date()
-    target_date = date_helper.format_date_for_api(tomorrow_info)
+    try:
+        driver = browser_manager.create_driver()
+    except Exception:
+        # 打破屏障，避免其他账户一直等待
+        if barrier is not None:
+            barrier.abort()
+        raise
+
+    # 创建浏览器后的流程无论成功或异常都要关闭浏览器，
+    # 避免子进程结束后遗留Edge和msedgedriver进程
+    try:
+        # 初始化各个模块
+        element_helper = get_element_helper(driver)
+        date_helper = get_date_helper()
+        slider_captcha = create_slider_captcha(driver, logger)
+        login_handler = create_login_handler(driver, element_helper, logger)
+        reservation_handler = create_reservation_handler(
+            driver,
+            element_helper,
+            date_helper,
+            slider_captcha,
+            logger
+        )
     
-    result = {
-        'account_name': account_name,
-        'success': False,
-        'seat_number': None,
-        'message': '',
-        'date': target_date
-    }
-
-    # 执行预约流程
-    # 1. 登录
-    if not login_handler.login(username, password):
-        logger.error(f"{account_name}: 登录失败")
-        logger.save_error_screenshot(driver, "login_failed")
-        result['message'] = '登录失败'
-        browser_manager.quit_driver()
-        
         # 记录结果
-        with results_lock:
-            reservation_results.append(result)
+        tomorrow_info = date_helper.get_tomorrow_date()
+        target_date = date_helper.format_date_for_api(tomorrow_info)
+    
+        result = {
+            'account_name': account_name,
+            'success': False,
+            'seat_number': None,
+            'message': '',
+            'date': target_date
+        }
+
+        # 等待所有账户的浏览器就绪后同时开始
+        if barrier is not None:
+            try:
+                barrier.wait(timeout=settings.START_BARRIER_TIMEOUT)
+            except threading.BrokenBarrierError:
+                # 其他账户启动失败或等待超时，不影响本账户继续执行
+                pass
+
+        # 执行预约流程
+        # 1. 登录
+        if not login_handler.login(username, password):
+            logger.error(f"{account_name}: 登录失败")
+            logger.save_error_screenshot(driver, "login_failed")
+            result['message'] = '登录失败'
         
-        # 发送失败通知
-        if notifier and settings.NOTIFY_ON_FAILURE:
-            send_wechat_sync(
-                notifier,
-                notifier.send_failure_notification(
-                    date=result['date'],
-                    account_name=account_name,
-                    error_message='登录失败',
-                    room_name=settings.TARGET_ROOM,
-                    attempted_seats=seat_numbers,
-                    mention_all=settings.WECHAT_WORK_MENTION_ALL
+            # 发送失败通知
+            if notifier and settings.NOTIFY_ON_FAILURE:
+                send_wechat_sync(
+                    notifier,
+                    notifier.send_failure_notification(
+                        date=result['date'],
+                        account_name=account_name,
+                        error_message='登录失败',
+                        room_name=settings.TARGET_ROOM,
+                        attempted_seats=seat_numbers,
+                        mention_all=settings.WECHAT_WORK_MENTION_ALL
+                    )
                 )
-            )
-        return
-
-    # 2. 预约
-    reservation_result = reservation_handler.reserve(seat_numbers)
-    if reservation_result:
-        result['success'] = True
-        result['seat_number'] = reservation_result.get('seat_number', seat_numbers[0])
-        result['message'] = '预约成功'
-        print(f"🎉 {account_name}: 预约成功 - 座位{result['seat_number']}！")
+                shutdown_notifications()
+            return result
+
+        # 2. 预约
+        reservation_result = reservation_handler.reserve(seat_numbers)
+        if reservation_result:
+            result['success'] = True
+            result['seat_number'] = reservation_result.get('seat_number', seat_numbers[0])
+            result['message'] = '预约成功'
+            print(f"🎉 {account_name}: 预约成功 - 座位{result['seat_number']}！")
         
-        # 发送成功通知
-        if notifier and settings.NOTIFY_ON_SUCCESS:
-            send_wechat_sync(
-                notifier,
-                notifier.send_success_notification(
-                    seat_number=result['seat_number'],
-                    date=result['date'],
-                    account_name=account_name,
-                    attempts=reservation_result.get('attempts', 1),
-                    room_name=settings.TARGET_ROOM,
-                    mention_all=settings.WECHAT_WORK_MENTION_ALL
+            # 发送成功通知
+            if notifier and settings.NOTIFY_ON_SUCCESS:
+                send_wechat_sync(
+                    notifier,
+                    notifier.send_success_notification(
+                        seat_number=result['seat_number'],
+                        date=result['date'],
+                        account_name=account_name,
+                        attempts=reservation_result.get('attempts', 1),
+                        room_name=settings.TARGET_ROOM,
+                        mention_all=settings.WECHAT_WORK_MENTION_ALL
+                    )
                 )
-            )
-    else:
-        result['message'] = '预约失败 - 所有座位不可用'
-        logger.error(f"{account_name}: 预约失败")
-        logger.save_error_screenshot(driver, "reservation_failed")
+        else:
+            result['message'] = '预约失败 - 所有座位不可用'
+            logger.error(f"{account_name}: 预约失败")
+            logger.save_error_screenshot(driver, "reservation_failed")
         
-        # 发送失败通知
-        if notifier and settings.NOTIFY_ON_FAILURE:
-            send_wechat_sync(
-                notifier,
-                notifier.send_failure_notification(
-                    date=result['date'],
-                    account_name=account_name,
-                    error_message='所有座位不可用',
-                    room_name=settings.TARGET_ROOM,
-                    attempted_seats=seat_numbers,
-                    mention_all=settings.WECHAT_WORK_MENTION_ALL
+            # 发送失败通知
+            if notifier and settings.NOTIFY_ON_FAILURE:
+                send_wechat_sync(
+                    notifier,
+                    notifier.send_failure_notification(
+                        date=result['date'],
+                        account_name=account_name,
+                        error_message='所有座位不可用',
+                        room_name=settings.TARGET_ROOM,
+                        attempted_seats=seat_numbers,
+                        mention_all=settings.WECHAT_WORK_MENTION_ALL
+                    )
                 )
-            )
-    
-    # 记录结果
-    with results_lock:
-        reservation_results.append(result)
 
-    # 保持浏览器打开5秒
-    import time
-    time.sleep(5)
+        if notifier:
+            shutdown_notifications()
 
-    # 关闭浏览器
-    browser_manager.quit_driver()
+        # 保持浏览器打开一段时间（便于人工查看结果）
+        if settings.KEEP_BROWSER_OPEN_SECONDS > 0:
+            time.sleep(settings.KEEP_BROWSER_OPEN_SECONDS)
+
+        return result
+    finally:
+        browser_manager.quit_driver()
+
+
+def init_worker():
+    """子进程初始化：预先加载ddddocr模型，避免占用预约流程的时间"""
+    settings = get_settings()
+    # 使用NumPy边缘匹配时ddddocr仅作回退，首次需要时再加载
+    if settings.SLIDER_NUMPY_MATCH:
+        return
+    try:
+        from src.core.slider_captcha import get_ocr
+        get_ocr()
+    except Exception as e:
+        # 预热失败不影响启动，创建验证码处理器时会再次加载
+        print(f"⚠️  ddddocr预加载失败: {e}")
 
 
 def force_exit():
     """超时强制退出"""
+    import multiprocessing
+
     print("❌ 脚本运行超时，自动退出！")
+    # 终止仍在运行的账户子进程
+    for child in multiprocessing.active_children():
+        child.terminate()
     os._exit(1)
 
 
 def main():
     """主函数"""
+    settings = get_settings()
     start_time = datetime.now()
     
     print("=" * 60)
@@ -193,7 +347,7 @@ def main():
     print()
     print("⚠️  系统特性：")
     print("  1. 双账户并行预约")
-    print("  2. 自动识别滑块验证码（ddddocr）")
+    print("  2. 自动识别滑块验证码（NumPy边缘匹配 / ddddocr）")
     print("  3. 自动管理Edge驱动（webdriver-manager）")
     print("  4. 支持多个备选座位")
     print("  5. 仅记录错误日志")
@@ -201,12 +355,26 @@ def main():
     print()
     print("-" * 60)
 
+    # 账户配置有误时直接退出
+    if settings.ACCOUNT_ERRORS:
+        print("❌ 账户配置错误：")
+        for error in settings.ACCOUNT_ERRORS:
+            print(f"  {error}")
+        print("💡 请运行 python check_config.py 检查配置")
+        return
+
+    # 未配置任何账户时无需启动进程池
+    if not settings.ACCOUNTS:
+        print("❌ 未配置任何账户")
+        print("💡 请运行 python check_config.py 检查配置")
+        return
+
     # 显示账户配置
     print("📋 账户配置：")
     for i, account in enumerate(settings.ACCOUNTS, 1):
-        print(f"  {i}. {account['account_name']}")
-        print(f"     用户名: {account['username']}")
-        print(f"     座位号: {account['seat_numbers']}")
+        print(f"  {i}. {account.account_name}")
+        print(f"     用户名: {account.username}")
+        print(f"     座位号: {list(account.seat_numbers)}")
     print()
     
     # 显示微信通知状态
@@ -223,30 +391,54 @@ def main():
     timeout_timer.daemon = True
     timeout_timer.start()
 
-    # 启动线程
-    threads = []
-    for account in settings.ACCOUNTS:
-        thread = threading.Thread(
-            target=run_account,
-            args=(account,),
-            name=f"Thread-{account['account_name']}"
-        )
-        threads.append(thread)
-        thread.start()
-        print(f"✅ 线程 {thread.name} 已启动")
-
-        # 线程启动间隔
-        import time
-        time.sleep(2)
-
-    print()
-    print("-" * 60)
-    print("⏳ 等待预约流程完成...")
-    print()
-
-    # 等待所有线程完成
-    for thread in threads:
-        thread.join()
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+
+    # 每个账户一个子进程：验证码识别互不抢占GIL，单个浏览器崩溃不影响其他账户
+    # 浏览器创建完成后在屏障处汇合，再同时登录
+    reservation_results = []
+    with multiprocessing.Manager() as manager:
+        barrier = manager.Barrier(len(settings.ACCOUNTS))
+        with ProcessPoolExecutor(
+            max_workers=len(settings.ACCOUNTS),
+            initializer=init_worker
+        ) as executor:
+            futures = {}
+            for account in settings.ACCOUNTS:
+                future = executor.submit(run_account, account, barrier)
+                futures[future] = account
+                print(f"✅ 账户 {account.account_name} 已启动")
+
+            print()
+            print("-" * 60)
+            print("⏳ 等待预约流程完成...")
+            print()
+
+            # 收集各账户结果
+            for future in as_completed(futures):
+                account = futures[future]
+                try:
+                    reservation_results.append(future.result())
+                except BrokenProcessPool:
+                    # 任一子进程异常退出都会使进程池失效，所有未完成账户的结果均已丢失
+                    print(f"❌ {account.account_name}: 子进程异常退出，进程池已失效")
+                    reservation_results.append({
+                        'account_name': account.account_name,
+                        'success': False,
+                        'seat_number': None,
+                        'message': '子进程异常退出（进程池已失效）',
+                        'date': None
+                    })
+                except Exception as e:
+                    print(f"❌ {account.account_name}: 预约流程异常: {e}")
+                    reservation_results.append({
+                        'account_name': account.account_name,
+                        'success': False,
+                        'seat_number': None,
+                        'message': f'流程异常: {e}',
+                        'date': None
+                    })
 
     # 取消超时计时器
     if timeout_timer and timeout_timer.is_alive():
@@ -281,28 +473,26 @@ def main():
     print()
     print("=" * 60)
     
-    # 发送双账户报告通知
-    if (settings.WECHAT_WORK_ENABLED and settings.WECHAT_WORK_WEBHOOK_URL 
-        and len(reservation_results) > 1):
+    # 发送汇总报告通知（所有账户结果合并为一条消息）
+    notifier = get_notifier()
+    if notifier and reservation_results:
         try:
-            notifier = WeChatWorkNotifier(
-                webhook_url=settings.WECHAT_WORK_WEBHOOK_URL,
-                timeout=settings.WECHAT_WORK_TIMEOUT
-            )
-            
             send_wechat_sync(
                 notifier,
-                notifier.send_dual_account_report(
-                    successful=successful_count,
-                    failed=failed_count,
-                    execution_time=execution_time,
-                    results=reservation_results,
-                    mention_all=settings.WECHAT_WORK_MENTION_ALL
+                send_batched_report(
+                    notifier,
+                    reservation_results,
+                    successful_count,
+                    failed_count,
+                    execution_time
                 )
             )
-            print("📱 双账户报告已发送到企业微信")
+            print("📱 汇总报告已发送到企业微信")
         except Exception as e:
-            print(f"📱 发送双账户报告失败: {e}")
+            print(f"📱 发送汇总报告失败: {e}")
+
+    # 释放通知资源
+    shutdown_notifications()
 
 
 if __name__ == "__main__":
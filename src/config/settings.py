@@ -9,12 +9,91 @@
 5. 超时配置
 """
 
-import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Account:
+    """单个账户配置（构造时校验，之后不可变）"""
+
+    __slots__ = ('username', 'password', 'account_name', 'seat_numbers', 'profile_dir')
+
+    username: str
+    password: str
+    account_name: str
+    seat_numbers: Tuple[int, ...]
+    profile_dir: str
+
+    def __post_init__(self):
+        """校验字段并将座位号列表转换为元组"""
+        for field in ('username', 'password', 'account_name', 'profile_dir'):
+            if not str(getattr(self, field) or '').strip():
+                raise ValueError(f"{field} 未填写")
+
+        if not isinstance(self.seat_numbers, (list, tuple)):
+            raise ValueError("seat_numbers 必须是列表")
+        if not self.seat_numbers:
+            raise ValueError("seat_numbers 列表为空")
+        object.__setattr__(self, 'seat_numbers', tuple(self.seat_numbers))
+
+    def __reduce__(self):
+        # 冻结且使用__slots__的实例无法按默认方式反序列化，改为按构造参数重建
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+    @classmethod
+    def from_dict(cls, config: dict) -> 'Account':
+        """
+        从配置字典创建账户
+
+        Args:
+            config: ACCOUNTS 中的单个账户字典
+
+        Returns:
+            Account实例
+
+        Raises:
+            ValueError: 缺少字段或字段值不合法
+        """
+        for field in cls.__slots__:
+            if field not in config:
+                raise ValueError(f"缺少字段: {field}")
+        return cls(**{field: config[field] for field in cls.__slots__})
 
 
 class Settings:
     """配置管理类"""
 
+    def __init__(self):
+        """初始化实例级配置（路径等只在首次创建时计算一次）"""
+        # 校验账户配置并冻结为元组，错误信息汇总到 ACCOUNT_ERRORS
+        accounts = []
+        errors = []
+        for index, config in enumerate(Settings.ACCOUNTS, 1):
+            try:
+                accounts.append(Account.from_dict(config))
+            except ValueError as e:
+                errors.append(f"账户 {index}: {e}")
+
+        profile_dirs = [account.profile_dir for account in accounts]
+        if len(profile_dirs) != len(set(profile_dirs)):
+            errors.append("多个账户使用了相同的profile_dir，每个账户必须使用不同的profile_dir")
+
+        self.ACCOUNTS: Tuple[Account, ...] = tuple(accounts)
+        self.ACCOUNT_ERRORS: Tuple[str, ...] = tuple(errors)
+
+        # 项目根目录（src/config/settings.py 向上两级）
+        project_root = Path(__file__).resolve().parents[2]
+        self.PROJECT_ROOT = str(project_root)
+
+        # 日志目录
+        self.LOG_DIR = str(project_root / 'logs')
+
+        # 错误截图目录
+        self.ERROR_DIR = str(project_root / 'errors')
+
     # ==================== URL配置 ====================
     LOGIN_URL = (
         'https://m.ruc.edu.cn/uc/wap/login?redirect=https%3A%2F%2F'
@@ -23,19 +102,13 @@ class Settings:
 
     # HTTP座位查询API（复用原HTTP版本）
     SEAT_QUERY_API = 'https://yxkj.ruc.edu.cn/kyq/static/frontApi/seat/getSeatStatus'
+
+    # 座位查询结果缓存有效期（秒），过期后重新查询
+    SEAT_QUERY_CACHE_TTL = 5
     AUTH_API = 'https://yxkj.ruc.edu.cn/kyq/static/frontApi/auth/generateToken'
 
     # ==================== 路径配置 ====================
-    # 项目根目录
-    PROJECT_ROOT = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    )
-
-    # 日志目录
-    LOG_DIR = os.path.join(PROJECT_ROOT, 'logs')
-
-    # 错误截图目录
-    ERROR_DIR = os.path.join(PROJECT_ROOT, 'errors')
+    # PROJECT_ROOT / LOG_DIR / ERROR_DIR 在 __init__ 中计算
 
     # ==================== 浏览器配置 ====================
     # 浏览器类型
@@ -52,6 +125,32 @@ class Settings:
         '--no-sandbox',                   # 禁用沙箱模式
         '--disable-dev-shm-usage',        # 禁用/dev/shm使用
         '--disable-extensions',           # 禁用扩展
+        '--disable-background-networking',  # 禁用后台网络请求
+        '--disable-component-update',     # 禁用组件更新检查
+    ]
+
+    # 页面加载策略：eager 表示DOM解析完成即返回，不等待图片和第三方脚本
+    PAGE_LOAD_STRATEGY = 'eager'
+
+    # 通过CDP屏蔽的请求（统计/分析脚本，与预约流程无关）
+    BLOCKED_URL_PATTERNS = [
+        '*google-analytics.com*',
+        '*googletagmanager.com*',
+        '*hm.baidu.com*',
+        '*cnzz.com*',
+    ]
+
+    # 快速加载模式：关闭与预约流程无关的浏览器子系统，加快页面加载
+    # 注意：不能禁用图片，应用入口是<img>元素，滑块验证码也依赖图片
+    FAST_LOAD = True
+    FAST_LOAD_PREFS = {
+        'profile.default_content_setting_values.notifications': 2,  # 禁止通知
+        'profile.default_content_setting_values.geolocation': 2,    # 禁止定位
+        'profile.default_content_setting_values.media_stream': 2,   # 禁止摄像头/麦克风
+    }
+    FAST_LOAD_OPTIONS = [
+        '--disable-features=Translate,MediaRouter',  # 禁用翻译和投屏
+        '--autoplay-policy=user-gesture-required',   # 禁止媒体自动播放
     ]
     
     # 窗口大小和位置配置（双账户并排显示）
@@ -64,6 +163,12 @@ class Settings:
     # 全局超时（秒）
     GLOBAL_TIMEOUT = 300  # 5分钟
 
+    # 等待其他账户浏览器就绪的最长时间（秒），超时后本账户直接开始
+    START_BARRIER_TIMEOUT = 60
+
+    # 预约结束后保持浏览器打开的时间（秒），仅用于人工查看，0表示立即关闭
+    KEEP_BROWSER_OPEN_SECONDS = 0
+
     # 元素等待超时（秒）
     ELEMENT_WAIT_TIMEOUT = 10
 
@@ -79,6 +184,25 @@ class Settings:
     SLIDER_DISTANCE_OFFSET = 0
     SLIDER_SAFE_MARGIN = 0
     SLIDER_MIN_VALID_DISTANCE = 10
+
+    # 滑块距离识别方式
+    # True：优先用NumPy边缘匹配（无需加载模型，耗时约几毫秒），
+    #       置信度（匹配峰值偏离均值的标准差倍数）低于阈值时回退到ddddocr
+    # False：始终使用ddddocr
+    SLIDER_NUMPY_MATCH = True
+    SLIDER_NUMPY_MIN_CONFIDENCE = 5.0
+
+    # 滑块拖动方式
+    # 'actions'：ActionChains原生输入事件（默认，事件isTrusted为true）
+    # 'js'：在浏览器内一次性派发整条轨迹的鼠标事件，只需一次请求，
+    #       但事件为脚本合成，可能被验证码识别为机器操作
+    SLIDER_DRAG_MODE = 'actions'
+
+    # 是否通过CDP直接读取验证码接口的响应获取图片（默认关闭）
+    # 开启后浏览器会记录网络事件日志，读取失败时自动回退到从页面DOM获取
+    SLIDER_IMAGES_FROM_CDP = False
+    # 验证码图片接口URL中包含的关键字
+    SLIDER_CAPTCHA_API_KEYWORD = 'captcha'
     
     # ==================== 微信通知配置 📱 ====================
     # 是否启用微信通知（如不需要，设置为False）
@@ -100,6 +224,11 @@ class Settings:
     NOTIFY_ON_FAILURE = True  # 预约失败时发送通知
     NOTIFY_ON_EXCEPTION = True  # 发生异常时发送通知
     
+    # 是否为每个账户单独发送成功/失败通知
+    # 默认关闭：所有账户结束后，各账户的成功/失败通知与汇总报告合并为一条消息发送，
+    # 减少Webhook请求次数；开启后每个账户结束时立即单独发送
+    NOTIFY_PER_ACCOUNT = False
+    
     # ==================== 预约配置 ====================
     # 目标房间名称
     TARGET_ROOM = '研学中心学生工位'
@@ -181,11 +310,13 @@ class Settings:
         SUCCESS_MESSAGE = "//*[contains(text(), '预约成功')] | //*[contains(text(), '提交成功')]"
 
         @staticmethod
+        @lru_cache(maxsize=256)
         def get_room_xpath(room_name: str) -> str:
             """生成房间选择的XPath"""
             return f"//div[contains(@class, 'room-name') and contains(text(), '{room_name}')]"
 
         @staticmethod
+        @lru_cache(maxsize=256)
         def get_seat_xpath(seat_number: int) -> str:
             """生成座位选择的XPath"""
             return (
@@ -195,6 +326,23 @@ class Settings:
             )
 
 
-# 创建全局配置实例
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取全局配置实例（惰性单例）
+
+    首次调用时才创建Settings对象，之后始终返回同一个实例。
+    测试代码可通过 get_settings.cache_clear() 重置。
+
+    Returns:
+        Settings实例
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    """兼容 `from src.config.settings import settings`，首次访问时才创建实例"""
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -52,6 +52,19 @@ class BrowserManager:
         for option in settings.BROWSER_OPTIONS:
             options.add_argument(option)
 
+        # 快速加载模式
+        if settings.FAST_LOAD:
+            for option in settings.FAST_LOAD_OPTIONS:
+                options.add_argument(option)
+            options.add_experimental_option("prefs", settings.FAST_LOAD_PREFS)
+
+        # 页面加载策略
+        options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
+
+        # 记录网络事件，供滑块验证码从CDP直接读取图片接口响应
+        if settings.SLIDER_IMAGES_FROM_CDP:
+            options.set_capability("ms:loggingPrefs", {"performance": "ALL"})
+
         # 设置用户配置文件目录（保持登录状态）
         options.add_argument(f"--user-data-dir={self.profile_dir}")
 
@@ -66,6 +79,9 @@ class BrowserManager:
         # 创建浏览器实例
         self.driver = webdriver.Edge(service=service, options=options)
 
+        # 屏蔽统计分析类请求
+        self._block_urls(settings.BLOCKED_URL_PATTERNS)
+
         # 设置窗口大小和位置（双账户并排显示）
         if self.account_name and self.account_name in settings.WINDOW_POSITIONS:
             pos = settings.WINDOW_POSITIONS[self.account_name]
@@ -73,11 +89,28 @@ class BrowserManager:
             self.driver.set_window_size(pos['width'], pos['height'])
             print(f"✅ 窗口已设置: {self.account_name} - 位置({pos['x']}, {pos['y']}) 大小({pos['width']}x{pos['height']})")
 
-        # 设置隐式等待
-        self.driver.implicitly_wait(5)
+        # 关闭隐式等待：统一使用ElementHelper中的显式等待，
+        # 避免与显式等待叠加导致每次查找失败额外阻塞
+        self.driver.implicitly_wait(0)
 
         return self.driver
 
+    def _block_urls(self, patterns):
+        """
+        通过CDP屏蔽匹配的网络请求
+
+        Args:
+            patterns: URL通配符列表
+        """
+        if not patterns:
+            return
+
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        except Exception as e:
+            print(f"⚠️  屏蔽统计请求失败（不影响预约）: {e}")
+
     def quit_driver(self):
         """关闭浏览器"""
         if self.driver:
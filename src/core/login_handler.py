@@ -11,11 +11,22 @@
 
 import time
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
 
 from ..config.settings import settings
 from ..utils.element_helper import ElementHelper
 
+# 登录流程使用的定位器（导入时构建一次）
+USERNAME_LOCATOR = (By.XPATH, settings.XPath.USERNAME_INPUT)
+PASSWORD_LOCATOR = (By.XPATH, settings.XPath.PASSWORD_INPUT)
+LOGIN_BUTTON_LOCATOR = (By.XPATH, settings.XPath.LOGIN_BUTTON)
+APP_ENTRY_LOCATOR = (By.XPATH, settings.XPath.APP_ENTRY_IMAGE)
+APP_ICON_LOCATOR = (By.XPATH, settings.XPath.APP_ICON)
+
+# 按XPath查找第一个匹配节点，不存在时返回null（9 = FIRST_ORDERED_NODE_TYPE）
+_JS_FIND_BY_XPATH = (
+    "return document.evaluate(arguments[0], document, null, 9, null).singleNodeValue;"
+)
+
 
 class LoginHandler:
     """登录处理器"""
@@ -49,7 +60,7 @@ class LoginHandler:
 
         # 等待并输入用户名
         username_input = self.helper.wait_for_element(
-            (By.XPATH, settings.XPath.USERNAME_INPUT),
+            USERNAME_LOCATOR,
             timeout=15,
             condition="presence"
         )
@@ -61,16 +72,13 @@ class LoginHandler:
         username_input.send_keys(username)
 
         # 输入密码
-        password_input = self.driver.find_element(
-            By.XPATH,
-            settings.XPath.PASSWORD_INPUT
-        )
+        password_input = self.driver.find_element(*PASSWORD_LOCATOR)
         password_input.send_keys(password)
 
         # 点击登录按钮并等待应用入口出现
         if not self.helper.click_and_wait(
-            (By.XPATH, settings.XPath.LOGIN_BUTTON),
-            (By.XPATH, settings.XPath.APP_ENTRY_IMAGE),
+            LOGIN_BUTTON_LOCATOR,
+            APP_ENTRY_LOCATOR,
             description="登录按钮",
             wait_time=15
         ):
@@ -79,8 +87,8 @@ class LoginHandler:
 
         # 进入应用
         if not self.helper.click_and_wait(
-            (By.XPATH, settings.XPath.APP_ENTRY_IMAGE),
-            (By.XPATH, settings.XPath.APP_ICON),
+            APP_ENTRY_LOCATOR,
+            APP_ICON_LOCATOR,
             description="应用入口",
             wait_time=15
         ):
@@ -94,19 +102,15 @@ class LoginHandler:
 
     def _handle_iknow_popup(self):
         """处理"我知道了"弹窗（可能不存在）"""
-        try:
-            iknow_button = self.helper.wait_for_element(
-                (By.XPATH, settings.XPath.IKNOW_BUTTON),
-                timeout=5,
-                condition="clickable"
-            )
-
-            if iknow_button:
-                self.helper.safe_click(iknow_button, "我知道了按钮")
-                time.sleep(0.5)
-        except TimeoutException:
-            # 弹窗不存在，正常跳过
-            pass
+        # 单次脚本调用立即返回，弹窗不存在时无需等待超时
+        iknow_button = self.driver.execute_script(
+            _JS_FIND_BY_XPATH,
+            settings.XPath.IKNOW_BUTTON
+        )
+
+        if iknow_button:
+            self.helper.safe_click(iknow_button, "我知道了按钮")
+            time.sleep(0.3)
 
 
 def create_login_handler(driver, element_helper: ElementHelper, logger) -> LoginHandler:
@@ -11,16 +11,36 @@
 7. 确认预约成功
 """
 
-import time
 from typing import List
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 
 from ..config.settings import settings
 from ..utils.element_helper import ElementHelper
 from ..utils.date_helper import DateHelper
 from .slider_captcha import SliderCaptcha
 
+# 预约流程使用的定位器（导入时构建一次）
+SEAT_SELECT_TAB_LOCATOR = (By.XPATH, settings.XPath.SEAT_SELECT_TAB)
+ROOM_LIST_LOCATOR = (By.XPATH, settings.XPath.ROOM_LIST)
+DATE_PICKER_LOCATOR = (By.XPATH, settings.XPath.DATE_PICKER)
+CALENDAR_GRID_LOCATOR = (By.XPATH, settings.XPath.CALENDAR_GRID)
+CONFIRM_DATE_BUTTON_LOCATOR = (By.XPATH, settings.XPath.CONFIRM_DATE_BUTTON)
+SEAT_MAP_LOCATOR = (By.XPATH, settings.XPath.SEAT_MAP)
+SEAT_ITEM_LOCATOR = (By.XPATH, settings.XPath.SEAT_ITEM)
+CONFIRM_BUTTON_LOCATOR = (By.XPATH, settings.XPath.CONFIRM_BUTTON)
+SLIDER_CAPTCHA_POPUP_LOCATOR = (By.XPATH, settings.XPath.SLIDER_CAPTCHA_POPUP)
+
+# 出现成功提示或验证码弹窗消失时返回true（9 = FIRST_ORDERED_NODE_TYPE）
+_JS_RESERVATION_DONE = """
+    function find(xpath) {
+        return document.evaluate(xpath, document, null, 9, null).singleNodeValue;
+    }
+    return find(arguments[0]) !== null || find(arguments[1]) === null;
+"""
+
 
 class ReservationHandler:
     """预约流程处理器"""
@@ -58,8 +78,8 @@ class ReservationHandler:
         """
         # 点击预约选座标签
         if not self.helper.click_and_wait(
-            (By.XPATH, settings.XPath.SEAT_SELECT_TAB),
-            (By.XPATH, settings.XPath.ROOM_LIST),
+            SEAT_SELECT_TAB_LOCATOR,
+            ROOM_LIST_LOCATOR,
             description="预约选座",
             wait_time=15
         ):
@@ -86,7 +106,7 @@ class ReservationHandler:
         # 点击房间并等待日期选择器出现
         if not self.helper.click_and_wait(
             (By.XPATH, room_xpath),
-            (By.XPATH, settings.XPath.DATE_PICKER),
+            DATE_PICKER_LOCATOR,
             description=f"房间: {room_name}",
             wait_time=10
         ):
@@ -95,7 +115,7 @@ class ReservationHandler:
 
         # 等待日历加载
         calendar_element = self.helper.wait_for_element(
-            (By.XPATH, settings.XPath.CALENDAR_GRID),
+            CALENDAR_GRID_LOCATOR,
             timeout=10,
             condition="visible"
         )
@@ -104,7 +124,6 @@ class ReservationHandler:
             self.logger.error("日历加载失败")
             return False
 
-        time.sleep(0.5)
         return True
 
     def select_date(self) -> bool:
@@ -120,39 +139,29 @@ class ReservationHandler:
         # 生成日期XPath
         date_xpath = self.date_helper.generate_date_xpath(date_info)
 
-        # 等待目标日期元素出现
+        # 等待目标日期可点击（可点击已包含存在且可见）
         date_element = self.helper.wait_for_element(
             (By.XPATH, date_xpath),
             timeout=20,
-            condition="presence"
+            condition="clickable"
         )
 
         if not date_element:
             self.logger.error(f"未找到目标日期: {date_info['day_str']}号")
             return False
 
-        # 滚动到元素
+        # 滚动到元素（scrollIntoView为同步滚动，无需等待）
         self.helper.scroll_to_element(date_element)
-        time.sleep(0.5)
-
-        # 等待元素可点击
-        date_element = self.helper.wait_for_element(
-            (By.XPATH, date_xpath),
-            timeout=10,
-            condition="clickable"
-        )
 
         # 点击日期
         if not self.helper.safe_click(date_element, f"目标日期{date_info['day_str']}号"):
             self.logger.error("点击目标日期失败")
             return False
 
-        time.sleep(0.5)
-
-        # 确认日期
+        # 确认日期（未选中日期时确认按钮处于禁用状态，click_and_wait会等待其可点击）
         if not self.helper.click_and_wait(
-            (By.XPATH, settings.XPath.CONFIRM_DATE_BUTTON),
-            (By.XPATH, settings.XPath.SEAT_MAP),
+            CONFIRM_DATE_BUTTON_LOCATOR,
+            SEAT_MAP_LOCATOR,
             description="日期确认按钮",
             wait_time=10
         ):
@@ -161,7 +170,7 @@ class ReservationHandler:
 
         # 等待座位图加载
         seat_item = self.helper.wait_for_element(
-            (By.XPATH, settings.XPath.SEAT_ITEM),
+            SEAT_ITEM_LOCATOR,
             timeout=20,
             condition="visible"
         )
@@ -170,7 +179,6 @@ class ReservationHandler:
             self.logger.error("座位图加载失败")
             return False
 
-        time.sleep(0.5)
         return True
 
     def select_seat(self, seat_numbers: List[int]) -> bool:
@@ -183,26 +191,35 @@ class ReservationHandler:
         Returns:
             是否选择成功
         """
-        for seat_number in seat_numbers:
-            seat_xpath = settings.XPath.get_seat_xpath(seat_number)
+        # 一次脚本调用找出优先级最高的可点击座位，点击失败则从候选中移除
+        candidates = list(seat_numbers)
+        while candidates:
+            seat_xpaths = [settings.XPath.get_seat_xpath(n) for n in candidates]
+            index, seat_element = self.helper.first_present(seat_xpaths, timeout=5)
 
-            # 尝试查找座位
-            seat_element = self.helper.wait_for_element(
-                (By.XPATH, seat_xpath),
-                timeout=5,
-                condition="clickable"
-            )
+            if seat_element is None:
+                break
 
-            if not seat_element:
-                self.logger.error(f"座位{seat_number}不可用，尝试下一个")
-                continue
+            seat_number = candidates.pop(index)
+            # 排在前面的座位不可点击，已被跳过
+            for skipped in candidates[:index]:
+                self.logger.error(f"座位{skipped}不可用，尝试下一个")
+            del candidates[:index]
 
             # 点击座位
             if not self.helper.safe_click(seat_element, f"座位{seat_number}"):
                 self.logger.error(f"点击座位{seat_number}失败")
                 continue
 
-            time.sleep(1)
+            # 等待选座后的确定按钮可点击
+            if not self.helper.wait_for_element(
+                CONFIRM_BUTTON_LOCATOR,
+                timeout=5,
+                condition="clickable"
+            ):
+                self.logger.error(f"选择座位{seat_number}后未出现确定按钮")
+                continue
+
             return True
 
         self.logger.error("所有备选座位均不可用")
@@ -217,7 +234,7 @@ class ReservationHandler:
         """
         # 点击确定按钮
         confirm_button = self.helper.wait_for_element(
-            (By.XPATH, settings.XPath.CONFIRM_BUTTON),
+            CONFIRM_BUTTON_LOCATOR,
             timeout=5,
             condition="clickable"
         )
@@ -232,7 +249,7 @@ class ReservationHandler:
 
         # 等待验证码弹窗出现
         captcha_popup = self.helper.wait_for_element(
-            (By.XPATH, settings.XPath.SLIDER_CAPTCHA_POPUP),
+            SLIDER_CAPTCHA_POPUP_LOCATOR,
             timeout=15,
             condition="visible"
         )
@@ -250,23 +267,18 @@ class ReservationHandler:
         Returns:
             是否成功
         """
-        # 检查成功提示
-        success_element = self.helper.wait_for_element(
-            (By.XPATH, settings.XPath.SUCCESS_MESSAGE),
-            timeout=5,
-            condition="presence"
-        )
-
-        if success_element:
+        # 出现成功提示，或验证码弹窗消失（也认为可能成功），每次轮询只需一次脚本调用
+        try:
+            WebDriverWait(self.driver, 5, poll_frequency=0.2).until(
+                lambda d: d.execute_script(
+                    _JS_RESERVATION_DONE,
+                    settings.XPath.SUCCESS_MESSAGE,
+                    settings.XPath.SLIDER_CAPTCHA_POPUP
+                )
+            )
             return True
-
-        # 如果验证码弹窗消失也认为可能成功
-        captcha_popups = self.driver.find_elements(
-            By.XPATH,
-            settings.XPath.SLIDER_CAPTCHA_POPUP
-        )
-
-        return len(captcha_popups) == 0
+        except TimeoutException:
+            return False
 
     def reserve(self, seat_numbers: List[int]) -> bool:
         """
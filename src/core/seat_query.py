@@ -10,8 +10,14 @@ HTTP座位查询模块
 实际使用中可以扩展为完整的HTTP查询系统
 """
 
+import asyncio
+import aiohttp
+import time
 import requests
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from ..config.settings import settings
+from ..utils.json_helper import json_loads
 
 
 class SeatQuery:
@@ -34,6 +40,13 @@ class SeatQuery:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
 
+        # 异步查询复用的HTTP会话（首次异步查询时创建）
+        self._async_session: Optional[aiohttp.ClientSession] = None
+
+        # 按(房间ID, 日期)缓存的可用座位集合：{键: (过期时间, 座位集合)}
+        # 只缓存成功的查询，超过SEAT_QUERY_CACHE_TTL或调用clear_cache后失效
+        self._seat_cache: Dict[Tuple[str, str], Tuple[float, frozenset]] = {}
+
     def query_available_seats(
         self,
         room_id: str,
@@ -49,8 +62,19 @@ class SeatQuery:
         Returns:
             可用座位号列表
         """
-        api_url = 'https://yxkj.ruc.edu.cn/kyq/static/frontApi/seat/getSeatStatus'
+        return self._fetch_available_seats(room_id, date) or []
+
+    def _fetch_available_seats(self, room_id: str, date: str) -> Optional[List[int]]:
+        """
+        查询可用座位，查询失败时返回None（区别于没有空座的空列表）
 
+        Args:
+            room_id: 房间ID
+            date: 日期（格式：YYYY-MM-DD）
+
+        Returns:
+            可用座位号列表，失败返回None
+        """
         # 构建查询参数
         params = {
             'roomId': room_id,
@@ -58,17 +82,27 @@ class SeatQuery:
         }
 
         # 发送请求
-        response = self.session.get(api_url, params=params)
+        response = self.session.get(settings.SEAT_QUERY_API, params=params)
 
         if response.status_code != 200:
             self.logger.error(f"查询座位失败，状态码: {response.status_code}")
-            return []
+            return None
+
+        return self._parse_available_seats(json_loads(response.content))
 
-        data = response.json()
+    def _parse_available_seats(self, data: dict) -> Optional[List[int]]:
+        """
+        从API响应数据中解析可用座位号
+
+        Args:
+            data: API返回的JSON数据
 
+        Returns:
+            可用座位号列表，接口返回失败时为None
+        """
         if not data.get('success'):
             self.logger.error(f"查询座位失败: {data.get('msg')}")
-            return []
+            return None
 
         # 解析座位数据
         seats = data.get('data', {}).get('seats', [])
@@ -89,6 +123,8 @@ class SeatQuery:
         """
         检查指定座位是否可用
 
+        同一房间和日期的成功查询结果缓存SEAT_QUERY_CACHE_TTL秒，查询失败不缓存
+
         Args:
             room_id: 房间ID
             date: 日期
@@ -97,8 +133,134 @@ class SeatQuery:
         Returns:
             是否可用
         """
-        available_seats = self.query_available_seats(room_id, date)
-        return seat_number in available_seats
+        return seat_number in self._query_cached(room_id, date)
+
+    def _query_cached(self, room_id: str, date: str) -> frozenset:
+        """查询可用座位集合，优先使用未过期的缓存"""
+        key = (room_id, date)
+        now = time.monotonic()
+        cached = self._seat_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        seats = self._fetch_available_seats(room_id, date)
+        if seats is None:
+            # 查询失败不缓存，下次调用重新查询
+            self._seat_cache.pop(key, None)
+            return frozenset()
+
+        result = frozenset(seats)
+        self._seat_cache[key] = (now + settings.SEAT_QUERY_CACHE_TTL, result)
+        return result
+
+    def clear_cache(self):
+        """清空座位查询缓存（需要获取最新座位状态时调用）"""
+        self._seat_cache.clear()
+
+    async def _get_async_session(self) -> aiohttp.ClientSession:
+        """获取异步查询复用的HTTP会话"""
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = aiohttp.ClientSession(headers=dict(self.session.headers))
+        return self._async_session
+
+    async def aclose(self):
+        """关闭异步HTTP会话"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+    async def query_available_seats_async(
+        self,
+        room_id: str,
+        date: str
+    ) -> List[int]:
+        """
+        异步查询指定房间和日期的可用座位
+
+        Args:
+            room_id: 房间ID
+            date: 日期（格式：YYYY-MM-DD）
+
+        Returns:
+            可用座位号列表
+        """
+        params = {
+            'roomId': room_id,
+            'date': date
+        }
+
+        session = await self._get_async_session()
+        async with session.get(settings.SEAT_QUERY_API, params=params) as response:
+            if response.status != 200:
+                self.logger.error(f"查询座位失败，状态码: {response.status}")
+                return []
+
+            data = await response.json(content_type=None, loads=json_loads)
+
+        return self._parse_available_seats(data) or []
+
+    async def query_many_async(
+        self,
+        queries: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], List[int]]:
+        """
+        并发查询多个房间/日期的可用座位
+
+        Args:
+            queries: (房间ID, 日期) 列表
+
+        Returns:
+            {(房间ID, 日期): 可用座位号列表}
+        """
+        results = await asyncio.gather(
+            *(self.query_available_seats_async(room_id, date) for room_id, date in queries)
+        )
+        return dict(zip(queries, results))
+
+    async def check_seats_available_batch(
+        self,
+        room_id: str,
+        date: str,
+        seat_numbers: List[int]
+    ) -> Dict[int, bool]:
+        """
+        批量检查座位是否可用（只发送一次查询）
+
+        Args:
+            room_id: 房间ID
+            date: 日期
+            seat_numbers: 座位号列表
+
+        Returns:
+            {座位号: 是否可用}
+        """
+        available_seats = set(await self.query_available_seats_async(room_id, date))
+        return {seat_number: seat_number in available_seats for seat_number in seat_numbers}
+
+    def check_seats_available(
+        self,
+        room_id: str,
+        date: str,
+        seat_numbers: List[int]
+    ) -> Dict[int, bool]:
+        """
+        批量检查座位是否可用（同步版本）
+
+        Args:
+            room_id: 房间ID
+            date: 日期
+            seat_numbers: 座位号列表
+
+        Returns:
+            {座位号: 是否可用}
+        """
+        async def _check():
+            try:
+                return await self.check_seats_available_batch(room_id, date, seat_numbers)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_check())
 
 
 def create_seat_query(jwt_token: str, logger) -> SeatQuery:
@@ -3,30 +3,138 @@
 
 功能：
 1. 获取滑块验证码图片（从API）
-2. 使用ddddocr识别滑动距离
+2. 使用NumPy边缘匹配识别滑动距离（低置信度时回退ddddocr）
 3. 生成模拟人工的滑动轨迹
 4. 执行滑块拖动操作
 5. 验证结果判断
 
 技术栈：
-- ddddocr: 滑块距离识别
+- NumPy: 滑块缺口边缘匹配
+- ddddocr: 滑块距离识别（回退）
 - ease-out算法: 生成人工轨迹
 - ActionChains: 拖动操作
 """
 
-import time
+import io
+import json
 import base64
-import ddddocr
-from typing import List, Tuple, Optional
+import threading
+import numpy as np
+from PIL import Image
+from typing import TYPE_CHECKING, List, Tuple, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import MoveTargetOutOfBoundsException
+from selenium.common.exceptions import (
+    MoveTargetOutOfBoundsException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 
 from ..config.settings import settings
 
+if TYPE_CHECKING:  # ddddocr加载较慢，仅用于类型注解，运行时在get_ocr中按需导入
+    import ddddocr
+
+
+def _decode_data_uri(data: str) -> bytes:
+    """
+    解码 data URI（或纯 base64 字符串）为 bytes
+
+    只切片一次并直接解码，避免 split 产生的中间列表和多余拷贝。
+    """
+    idx = data.find('base64,')
+    return base64.b64decode(data[idx + 7:] if idx >= 0 else data)
+
+
+# tianai-captcha 接口响应中背景图和滑块图的字段名
+_CAPTCHA_BG_KEY = 'backgroundImage'
+_CAPTCHA_SLIDER_KEY = 'templateImage'
+
+
+def _find_key(obj, key: str):
+    """在嵌套的dict/list中查找第一个指定键的值"""
+    if isinstance(obj, dict):
+        if key in obj:
+            return obj[key]
+        obj = list(obj.values())
+    if isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                value = _find_key(item, key)
+                if value is not None:
+                    return value
+    return None
+
+
+# 背景图已加载完成（且与上次获取的不是同一张）、滑块图也已就绪时返回true
+_JS_BG_IMAGE_READY = """
+    var img = document.getElementById('tianai-captcha-slider-bg-img');
+    if (!img || !img.complete || img.naturalWidth === 0) return false;
+    if (arguments[0] && img.src.slice(-64) === arguments[0]) return false;
+
+    // 滑块图：独立img元素的src，或滑块按钮CSS背景中的data URI
+    var sliderImg = document.getElementById('tianai-captcha-slider-move-img');
+    if (sliderImg && sliderImg.tagName === 'IMG' && sliderImg.src) return true;
+    var sliderBtn = document.getElementById('tianai-captcha-slider-move-btn');
+    if (!sliderBtn) return false;
+    return window.getComputedStyle(sliderBtn).backgroundImage.indexOf('data:') >= 0;
+"""
+
+# 在浏览器内按轨迹派发鼠标事件（每步间隔约16ms），完成后回调true
+_JS_DRAG_TRACK = """
+    var btn = arguments[0], track = arguments[1], done = arguments[arguments.length - 1];
+    var rect = btn.getBoundingClientRect();
+    var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+
+    function fire(target, type, clientX) {
+        target.dispatchEvent(new MouseEvent(type, {
+            bubbles: true, cancelable: true, view: window,
+            clientX: clientX, clientY: y, screenX: clientX, screenY: y,
+            button: 0, buttons: type === 'mouseup' ? 0 : 1
+        }));
+    }
+
+    fire(btn, 'mousedown', x);
+    var i = 0;
+    function step() {
+        if (i < track.length) {
+            x += track[i++];
+            fire(document, 'mousemove', x);
+            setTimeout(step, 16);
+        } else {
+            fire(document, 'mouseup', x);
+            done(true);
+        }
+    }
+    setTimeout(step, 16);
+"""
+
+# 进程内共享的ddddocr滑块识别器（模型只加载一次）
+_OCR = None
+_OCR_LOCK = threading.Lock()
+
+
+def get_ocr() -> "ddddocr.DdddOcr":
+    """
+    获取进程内共享的ddddocr滑块识别器
+
+    首次调用时加载模型，之后直接返回同一实例；加锁避免多个线程同时加载。
+    ONNX Runtime推理会话可安全地被多个线程共用。
+
+    Returns:
+        DdddOcr实例（关闭检测/OCR模型，仅用于滑块匹配）
+    """
+    global _OCR
+    if _OCR is None:
+        with _OCR_LOCK:
+            if _OCR is None:
+                import ddddocr
+                _OCR = ddddocr.DdddOcr(det=False, ocr=False, show_ad=False)
+    return _OCR
+
 
 class SliderCaptcha:
     """滑块验证码处理器"""
@@ -42,8 +150,31 @@ class SliderCaptcha:
         self.driver = driver
         self.logger = logger
 
-        # 初始化ddddocr滑块识别器（关闭广告输出）
-        self.slider_recognizer = ddddocr.DdddOcr(det=False, ocr=False, show_ad=False)
+        # 最近一次获取图片时的背景图元素和尺寸信息
+        self.bg_image_element = None
+        self.bg_image_size = None
+        # 最近一次获取的背景图src末尾，用于判断验证失败后图片是否已刷新
+        self.bg_src_tail = None
+
+    def wait_for_images(self, timeout: float = 3.0) -> bool:
+        """
+        等待验证码背景图和滑块图加载完成
+
+        重试时额外等待背景图刷新为新的一张，避免重复识别旧图。
+
+        Args:
+            timeout: 等待超时时间
+
+        Returns:
+            两张图片是否在超时前就绪
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_JS_BG_IMAGE_READY, self.bg_src_tail)
+            )
+            return True
+        except TimeoutException:
+            return False
 
     def get_slider_images_from_api(self) -> Tuple[Optional[bytes], Optional[bytes]]:
         """
@@ -55,58 +186,179 @@ class SliderCaptcha:
         Returns:
             (背景图bytes, 滑块图bytes)，获取失败返回(None, None)
         """
-        # 等待验证码API加载完成
-        time.sleep(1)
-
-        # 通过JavaScript获取图片数据
+        # 等待验证码图片加载完成（超时后仍尝试读取，读取失败由调用方重试）
+        if not self.wait_for_images():
+            print("⚠️  等待验证码图片加载超时")
+
+        # 优先从CDP读取接口响应，无需在页面中执行脚本
+        if settings.SLIDER_IMAGES_FROM_CDP:
+            bg_base64, slider_base64 = self.read_images_from_cdp()
+            if isinstance(bg_base64, str) and isinstance(slider_base64, str):
+                self.bg_image_element = None
+                self.bg_image_size = None
+                self.bg_src_tail = bg_base64[-64:]
+                return _decode_data_uri(bg_base64), _decode_data_uri(slider_base64)
+
+        # 通过一次JavaScript调用同时获取背景图、滑块图和背景图尺寸
         # 实际项目中，这些图片数据可能存储在页面的某个变量中
         # 或者需要通过img/canvas元素获取
-        bg_base64 = self.driver.execute_script("""
+        state = self.driver.execute_script("""
+            var result = {bg: null, slider: null, bgElement: null, size: null};
+
             // tianai-captcha 背景图
             var bgImg = document.getElementById('tianai-captcha-slider-bg-img');
             if (bgImg && bgImg.tagName === 'IMG') {
-                return bgImg.src;
+                result.bg = bgImg.src;
+                result.bgElement = bgImg;
+
+                // 背景图原始宽度和显示宽度（用于计算缩放比例）
+                if (bgImg.naturalWidth === 0) {
+                    result.size = {success: false, error: '原始宽度为0'};
+                } else {
+                    result.size = {
+                        success: true,
+                        originalWidth: bgImg.naturalWidth,
+                        displayedWidth: bgImg.clientWidth,
+                        ratio: bgImg.clientWidth / bgImg.naturalWidth
+                    };
+                }
             }
-            return null;
-        """)
 
-        slider_base64 = self.driver.execute_script("""
             // tianai-captcha 滑块图（优先从img元素获取，否则从CSS背景图获取）
             // 方法1：独立img元素
             var sliderImg = document.getElementById('tianai-captcha-slider-move-img');
             if (sliderImg && sliderImg.tagName === 'IMG' && sliderImg.src) {
-                return sliderImg.src;
+                result.slider = sliderImg.src;
+                return result;
             }
             
             // 方法2：CSS背景图
             var sliderBtn = document.getElementById('tianai-captcha-slider-move-btn');
             if (sliderBtn) {
-                var bgImg = window.getComputedStyle(sliderBtn).backgroundImage;
-                if (bgImg && bgImg.startsWith('url')) {
+                var sliderBg = window.getComputedStyle(sliderBtn).backgroundImage;
+                if (sliderBg && sliderBg.startsWith('url')) {
                     // 提取 url("data:image/png;base64,...") 中的 data URI
-                    var match = bgImg.match(/url\\(["']?(data:image\\/[^;]+;base64,[^"')]+)["']?\\)/);
+                    var match = sliderBg.match(/url\\(["']?(data:image\\/[^;]+;base64,[^"')]+)["']?\\)/);
                     if (match) {
-                        return match[1];
+                        result.slider = match[1];
                     }
                 }
             }
-            return null;
-        """)
+            return result;
+        """) or {}
+
+        # 记录背景图元素和尺寸，供缩放比例计算复用
+        self.bg_image_element = state.get('bgElement')
+        self.bg_image_size = state.get('size')
 
+        bg_base64 = state.get('bg')
+        slider_base64 = state.get('slider')
         if not bg_base64 or not slider_base64:
             self.logger.error("获取滑块图片失败")
+            # 未拖动，验证码不会刷新，下次不再等待新图
+            self.bg_src_tail = None
             return None, None
 
+        self.bg_src_tail = bg_base64[-64:]
+
         # 转换为bytes
-        if 'base64,' in bg_base64:
-            bg_base64 = bg_base64.split('base64,')[1]
-        if 'base64,' in slider_base64:
-            slider_base64 = slider_base64.split('base64,')[1]
+        return _decode_data_uri(bg_base64), _decode_data_uri(slider_base64)
+
+    @property
+    def slider_recognizer(self) -> "ddddocr.DdddOcr":
+        """进程内共享的ddddocr滑块识别器，首次回退时才加载模型"""
+        return get_ocr()
+
+    def read_images_from_cdp(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        通过CDP读取最近一次验证码接口的响应，提取背景图和滑块图
+
+        从性能日志中找到最新的验证码接口响应，
+        再用 Network.getResponseBody 取出响应内容。
+
+        Returns:
+            (背景图base64, 滑块图base64)，没有新的响应或读取失败返回(None, None)
+        """
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as exc:
+            print(f"⚠️  读取性能日志失败: {exc}")
+            return None, None
+
+        request_id = None
+        for entry in reversed(entries):
+            message = json.loads(entry['message']).get('message', {})
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            params = message.get('params', {})
+            url = params.get('response', {}).get('url', '')
+            if settings.SLIDER_CAPTCHA_API_KEYWORD in url:
+                request_id = params.get('requestId')
+                break
+
+        if request_id is None:
+            return None, None
+
+        try:
+            result = self.driver.execute_cdp_cmd(
+                'Network.getResponseBody', {'requestId': request_id}
+            )
+            body = result.get('body', '')
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+            data = json.loads(body)
+        except Exception as exc:
+            print(f"⚠️  CDP读取验证码接口响应失败: {exc}")
+            return None, None
+
+        return _find_key(data, _CAPTCHA_BG_KEY), _find_key(data, _CAPTCHA_SLIDER_KEY)
+
+    def recognize_distance_np(
+        self,
+        bg_bytes: bytes,
+        slider_bytes: bytes
+    ) -> Tuple[int, float]:
+        """
+        使用NumPy边缘匹配识别滑块需要移动的距离
+
+        取滑块透明通道的轮廓像素作为模板，背景图用灰度梯度幅值作为边缘图，
+        在水平方向逐个偏移累加轮廓上的边缘强度，峰值位置即缺口位置。
 
-        bg_bytes = base64.b64decode(bg_base64)
-        slider_bytes = base64.b64decode(slider_base64)
+        Args:
+            bg_bytes: 背景图bytes数据
+            slider_bytes: 滑块图bytes数据
 
-        return bg_bytes, slider_bytes
+        Returns:
+            (滑动距离, 置信度)，置信度为峰值偏离均值的标准差倍数，无法识别时为(0, 0.0)
+        """
+        bg = np.asarray(Image.open(io.BytesIO(bg_bytes)).convert('L'), dtype=np.float32)
+        alpha = np.asarray(Image.open(io.BytesIO(slider_bytes)).convert('RGBA').getchannel('A'))
+
+        # 拼图块轮廓：不透明像素中至少有一个四邻域为透明的像素
+        mask = alpha > 0
+        padded = np.pad(mask, 1)
+        inner = padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:]
+        ys, xs = np.nonzero(mask & ~inner)
+
+        height, width = bg.shape
+        keep = ys < height
+        ys, xs = ys[keep], xs[keep]
+        offsets = width - (int(xs.max()) + 1) if xs.size else 0
+        if offsets <= 0:
+            return 0, 0.0
+
+        # 中心差分梯度，边缘两侧的像素都有响应，不受轮廓内外一像素偏差影响
+        grad_y, grad_x = np.gradient(bg)
+        edges = np.abs(grad_x) + np.abs(grad_y)
+
+        # score[d] = 轮廓平移d像素后覆盖的边缘强度之和
+        score = edges[ys[:, None], xs[:, None] + np.arange(offsets)].sum(axis=0)
+        peak = int(np.argmax(score))
+        std = float(score.std())
+        confidence = (float(score[peak]) - float(score.mean())) / std if std > 0 else 0.0
+
+        # 与ddddocr一致，返回滑块图（而非拼图块）左边缘的目标位置
+        return peak, confidence
 
     def recognize_distance(
         self,
@@ -114,7 +366,10 @@ class SliderCaptcha:
         slider_bytes: bytes
     ) -> int:
         """
-        使用ddddocr识别滑块需要移动的距离
+        识别滑块需要移动的距离
+
+        启用SLIDER_NUMPY_MATCH时先用NumPy边缘匹配，
+        置信度不足或出错时回退到ddddocr。
 
         Args:
             bg_bytes: 背景图bytes数据
@@ -123,6 +378,16 @@ class SliderCaptcha:
         Returns:
             滑动距离（像素），识别失败返回0
         """
+        if settings.SLIDER_NUMPY_MATCH:
+            try:
+                distance, confidence = self.recognize_distance_np(bg_bytes, slider_bytes)
+            except Exception as exc:
+                print(f"⚠️  NumPy边缘匹配失败，回退ddddocr: {exc}")
+            else:
+                if confidence >= settings.SLIDER_NUMPY_MIN_CONFIDENCE:
+                    return distance + settings.SLIDER_DISTANCE_OFFSET
+                print(f"⚠️  NumPy边缘匹配置信度不足({confidence:.2f})，回退ddddocr")
+
         result = self.slider_recognizer.slide_match(
             slider_bytes,
             bg_bytes,
@@ -136,58 +401,58 @@ class SliderCaptcha:
         return distance
 
     def generate_track(self, distance: int) -> List[int]:
-        """生成精细的人工滑动轨迹。"""
+        """
+        生成精细的人工滑动轨迹（先匀加速到中点，再匀减速，步长0.1s）
+
+        使用NumPy一次性计算各时刻位置，再差分得到每步移动量。
+        """
         target_distance = int(round(distance))
         if target_distance <= 0:
             return []
 
-        import math
-
-        raw_track: List[float] = []
-        current = 0.0
-        a1 = 50.0
-        a2 = -50.0
+        a = 50.0
         t = 0.1
 
-        t_acc = math.sqrt(max(target_distance / a1, 0.0))
-        mid_distance = 0.5 * a1 * t_acc * t_acc
-        v = 0.0
+        # 加速阶段：匀加速到中点，位置 s = a*τ²/2
+        mid_distance = target_distance / 2.0
+        n_acc = max(1, int(np.ceil(np.sqrt(2.0 * mid_distance / a) / t - 1e-9)))
+        tau = np.arange(1, n_acc + 1) * t
+        acc_positions = 0.5 * a * tau ** 2
 
-        while current < target_distance:
-            a = a1 if current < mid_distance else a2
-            v_old = v
-            v = max(0.0, v_old + a * t)
-            move = v_old * t + 0.5 * a * t * t
+        # 减速阶段：以峰值速度匀减速至0，位置 s = s0 + v·τ - a*τ²/2
+        v_peak = a * tau[-1]
+        n_dec = int(np.ceil(v_peak / a / t - 1e-9))
+        tau = np.arange(1, n_dec + 1) * t
+        dec_positions = acc_positions[-1] + v_peak * tau - 0.5 * a * tau ** 2
 
-            if current + move > target_distance:
-                move = target_distance - current
+        # 截断到目标距离并补齐终点，相邻位置差即每步移动量
+        positions = np.concatenate(([0.0], acc_positions, dec_positions, [target_distance]))
+        moves = np.diff(np.minimum(positions, target_distance))
+        moves = moves[moves >= 0.5]
+        if moves.size == 0:
+            moves = np.array([float(target_distance)])
 
-            current += move
+        track = np.maximum(1, np.round(moves)).astype(int)
+        track[-1] = max(1, track[-1] + target_distance - int(track.sum()))
 
-            if move >= 0.5:
-                raw_track.append(move)
+        return track.tolist()
 
-        if not raw_track:
-            raw_track.append(float(target_distance))
-
-        track = [max(1, int(round(step))) for step in raw_track]
-        delta = target_distance - sum(track)
-        track[-1] = max(1, track[-1] + delta)
-
-        return track
-
-    def calculate_scale_ratio(self) -> float:
+    def calculate_scale_ratio(self, size_info: Optional[dict] = None) -> float:
         """
         计算背景图的缩放比例（显示宽度/原始宽度）
         
-        ddddocr识别的坐标是基于原始图片的，但浏览器可能对图片进行了缩放。
+        识别出的坐标是基于原始图片的，但浏览器可能对图片进行了缩放。
         需要计算缩放比例来调整实际移动距离。
         
+        Args:
+            size_info: 已获取的背景图尺寸信息（来自get_slider_images_from_api），
+                为None时重新查询页面
+        
         Returns:
             float: 缩放比例（默认为1.0）
         """
         try:
-            result = self.driver.execute_script("""
+            result = size_info or self.driver.execute_script("""
                 var bgImg = document.getElementById('tianai-captcha-slider-bg-img');
                 if (!bgImg) {
                     return {success: false, error: '找不到背景图元素'};
@@ -229,36 +494,53 @@ class SliderCaptcha:
             self.logger.error(f"计算缩放比例异常: {e}")
             return 1.0
     
-    def drag_slider(self, track: List[int]) -> bool:
+    def find_slider_button(self, timeout: int = 10):
         """
-        执行滑块拖动操作
+        定位滑块按钮（tianai-captcha）
 
         Args:
-            track: 滑动轨迹列表
+            timeout: 等待超时时间
 
         Returns:
-            拖动是否成功
+            滑块按钮元素
         """
-        # 定位滑块按钮（tianai-captcha）
-        slider_btn = WebDriverWait(self.driver, 10).until(
+        return WebDriverWait(self.driver, timeout).until(
             EC.presence_of_element_located(
                 (By.XPATH, settings.XPath.SLIDER_BUTTON)
             )
         )
 
+    def drag_slider(self, slider_btn, track: List[int]) -> bool:
+        """
+        执行滑块拖动操作
+
+        Args:
+            slider_btn: 滑块按钮元素
+            track: 滑动轨迹列表
+
+        Returns:
+            拖动是否成功
+
+        Raises:
+            StaleElementReferenceException: 滑块按钮已被重新渲染，需重新定位
+        """
+        if settings.SLIDER_DRAG_MODE == 'js':
+            return self.drag_slider_js(slider_btn, track)
+
         # 创建动作链
         action = ActionChains(self.driver)
 
         try:
-            action.click_and_hold(slider_btn).perform()
-
-            for i, move in enumerate(track):
-                action.move_by_offset(move, 0)
-                if (i + 1) % 5 == 0 or i == len(track) - 1:
-                    action.perform()
+            # 整条轨迹在客户端排队，只在最后 perform 一次；
+            # pause 由浏览器端执行，不增加额外的请求
+            action.click_and_hold(slider_btn)
+            for move in track:
+                action.move_by_offset(move, 0).pause(0.01)
 
-            action.release().perform()
+            action.pause(0.05).release().perform()
             return True
+        except StaleElementReferenceException:
+            raise
         except MoveTargetOutOfBoundsException as exc:
             self.logger.error(f"拖动滑块时坐标超出范围: {exc}")
         except Exception as exc:
@@ -271,6 +553,28 @@ class SliderCaptcha:
 
         return False
 
+    def drag_slider_js(self, slider_btn, track: List[int]) -> bool:
+        """
+        在浏览器内派发鼠标事件完成整条轨迹的拖动（仅一次WebDriver请求）
+
+        tianai-captcha 在滑块按钮上监听 mousedown，在 document 上监听
+        mousemove/mouseup，因此按同样的目标派发事件。
+
+        Args:
+            slider_btn: 滑块按钮元素
+            track: 滑动轨迹列表
+
+        Returns:
+            拖动是否成功
+        """
+        try:
+            return bool(self.driver.execute_async_script(_JS_DRAG_TRACK, slider_btn, track))
+        except StaleElementReferenceException:
+            raise
+        except Exception as exc:
+            self.logger.error(f"JS拖动滑块时发生异常: {exc}")
+            return False
+
     def verify_result(self, timeout: float = 1.0) -> bool:
         """
         验证滑块验证是否成功
@@ -281,18 +585,14 @@ class SliderCaptcha:
         Returns:
             验证是否成功
         """
-        time.sleep(timeout)
-
-        # 检查验证码弹窗是否消失（tianai-captcha）
-        slider_popups = self.driver.find_elements(
-            By.XPATH,
-            settings.XPath.SLIDER_CAPTCHA_POPUP
-        )
-
-        if not slider_popups:
+        # 验证码弹窗消失即验证成功（tianai-captcha）
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: not d.find_elements(By.XPATH, settings.XPath.SLIDER_CAPTCHA_POPUP)
+            )
             return True
-
-        return False
+        except TimeoutException:
+            return False
 
     def handle_slider_captcha(self, max_attempts: int = 10) -> bool:
         """
@@ -311,11 +611,16 @@ class SliderCaptcha:
                     (By.XPATH, settings.XPath.SLIDER_CAPTCHA_POPUP)
                 )
             )
-            time.sleep(0.2)
+            # 滑块按钮在重试间保持不变，只定位一次
+            slider_btn = self.find_slider_button()
         except Exception as e:
             self.logger.error(f"滑块验证框未出现: {e}")
             return False
 
+        # 背景图显示尺寸在同一弹窗内不变，缩放比例只在首次或背景图重新渲染时计算
+        scale_ratio = None
+        bg_element = None
+
         for attempt in range(1, max_attempts + 1):
             print(f"\n🔄 第{attempt}次尝试滑块验证...")
             
@@ -323,26 +628,33 @@ class SliderCaptcha:
             bg_bytes, slider_bytes = self.get_slider_images_from_api()
             if not bg_bytes or not slider_bytes:
                 self.logger.error(f"第{attempt}次: 获取滑块图片失败")
-                time.sleep(0.5)
                 continue
 
-            # 2. 识别需要移动的距离（ddddocr直接返回移动距离）
+            # 2. 识别需要移动的距离（直接返回移动距离）
             distance = self.recognize_distance(bg_bytes, slider_bytes)
             
-            print(f"✅ ddddocr识别移动距离: {distance}px（原始图片坐标系）")
+            print(f"✅ 识别移动距离: {distance}px（原始图片坐标系）")
             
             # 异常检测：识别距离过小可能是错误
             if distance < 20:
-                print(f"⚠️  警告：识别距离异常小({distance}px)，可能是ddddocr识别错误")
+                print(f"⚠️  警告：识别距离异常小({distance}px)，可能是识别错误")
             
-            # 3. 计算图片缩放比例
-            # 等待一下确保图片完全加载
-            time.sleep(0.1)
-            scale_ratio = self.calculate_scale_ratio()
+            # 3. 计算图片缩放比例（背景图元素未变化时复用上次结果）
+            # 尺寸信息已随图片一并获取，无需额外请求
+            ratio = scale_ratio
+            if ratio is None or self.bg_image_element != bg_element:
+                ratio = self.calculate_scale_ratio(self.bg_image_size)
+                # 尺寸获取失败时不缓存（本次使用回退比例），下次重新计算
+                if self.bg_image_size and self.bg_image_size.get('success'):
+                    scale_ratio = ratio
+                    bg_element = self.bg_image_element
+                else:
+                    scale_ratio = None
+                    bg_element = None
             
             # 4. 根据缩放比例调整距离
-            adjusted_distance = int(distance * scale_ratio)
-            print(f"🎯 缩放调整后距离: {adjusted_distance}px (缩放比例 {scale_ratio:.4f})")
+            adjusted_distance = int(distance * ratio)
+            print(f"🎯 缩放调整后距离: {adjusted_distance}px (缩放比例 {ratio:.4f})")
             
             # 5. 应用安全边距，避免过冲
             final_distance = adjusted_distance - settings.SLIDER_SAFE_MARGIN
@@ -353,15 +665,27 @@ class SliderCaptcha:
             track = self.generate_track(final_distance)
             if not track:
                 self.logger.error(f"第{attempt}次: 轨迹生成为空，滑动距离 {final_distance}px")
-                time.sleep(0.5)
+                # 未拖动，验证码不会刷新，下次直接读取当前图片
+                self.bg_src_tail = None
                 continue
             total_move = sum(track)
             print(f"✅ 生成轨迹: {len(track)}个移动点，总移动{total_move}px")
 
             # 7. 拖动滑块
-            if not self.drag_slider(track):
+            try:
+                dragged = self.drag_slider(slider_btn, track)
+            except StaleElementReferenceException:
+                # 按钮被重新渲染，重新定位后再拖一次
+                try:
+                    slider_btn = self.find_slider_button()
+                    dragged = self.drag_slider(slider_btn, track)
+                except Exception as exc:
+                    self.logger.error(f"重新定位滑块按钮失败: {exc}")
+                    dragged = False
+            if not dragged:
                 self.logger.error(f"第{attempt}次: 拖动滑块失败")
-                time.sleep(0.5)
+                # 未完成拖动，验证码不一定刷新，下次直接读取当前图片
+                self.bg_src_tail = None
                 continue
             
             print(f"✅ 拖动完成，等待验证结果...")
@@ -373,7 +697,6 @@ class SliderCaptcha:
 
             print(f"❌ 验证失败，准备重试...")
             self.logger.error(f"第{attempt}次: 滑块验证失败，重试...")
-            time.sleep(0.5)
 
         self.logger.error(f"滑块验证失败，已达到最大尝试次数: {max_attempts}")
         return False
@@ -9,6 +9,41 @@
 
 import pytz
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+# 目标日期XPath模板（导入时拼接一次）
+_DATE_XPATH_TEMPLATE = (
+    "//div[@class='van-calendar__month']"
+    "["
+    "    (./div[@class='van-calendar__month-title' "
+    "and normalize-space(.)='{year_month_text}'])"
+    "    or "
+    "    ("
+    "        ./div[@class='van-calendar__days']/"
+    "div[@class='van-calendar__month-mark' "
+    "and normalize-space(.)='{month_mark_text}']"
+    "        and "
+    "        not(./div[@class='van-calendar__month-title'])"
+    "    )"
+    "]"
+    "/div[@class='van-calendar__days']"
+    # 具体日期单元格的XPath部分
+    "/div[@role='gridcell' and contains(@class, 'van-calendar__day') "
+    "and not(contains(@class, 'van-calendar__day--disabled')) "
+    "and normalize-space(text()[1]) = '{day_str}' "
+    "and ./div[contains(@class, 'van-calendar__bottom-info') "
+    "and contains(text(), '可约')]]"
+)
+
+
+@lru_cache(maxsize=32)
+def _build_date_xpath(day_str: str, year_month_text: str, month_mark_text: str) -> str:
+    """按日期填充XPath模板（结果缓存）"""
+    return _DATE_XPATH_TEMPLATE.format(
+        day_str=day_str,
+        year_month_text=year_month_text,
+        month_mark_text=month_mark_text
+    )
 
 
 class DateHelper:
@@ -55,40 +90,12 @@ class DateHelper:
         Returns:
             完整的XPath字符串
         """
-        day_str = date_info['day_str']
-        year_month_text = date_info['year_month_text']
-        month_mark_text = date_info['month_mark_text']
-
-        # 具体日期单元格的XPath部分
-        day_specific_xpath_part = (
-            f"/div[@role='gridcell' and contains(@class, 'van-calendar__day') "
-            f"and not(contains(@class, 'van-calendar__day--disabled')) "
-            f"and normalize-space(text()[1]) = '{day_str}' "
-            f"and ./div[contains(@class, 'van-calendar__bottom-info') "
-            f"and contains(text(), '可约')]]"
+        return _build_date_xpath(
+            date_info['day_str'],
+            date_info['year_month_text'],
+            date_info['month_mark_text']
         )
 
-        # 完整的XPath
-        target_day_xpath = (
-            f"//div[@class='van-calendar__month']"
-            f"["
-            f"    (./div[@class='van-calendar__month-title' "
-            f"and normalize-space(.)='{year_month_text}'])"
-            f"    or "
-            f"    ("
-            f"        ./div[@class='van-calendar__days']/"
-            f"div[@class='van-calendar__month-mark' "
-            f"and normalize-space(.)='{month_mark_text}']"
-            f"        and "
-            f"        not(./div[@class='van-calendar__month-title'])"
-            f"    )"
-            f"]"
-            f"/div[@class='van-calendar__days']"
-            f"{day_specific_xpath_part}"
-        )
-
-        return target_day_xpath
-
     def format_date_for_api(self, date_info: dict) -> str:
         """
         格式化日期为API所需格式（YYYY-MM-DD）
@@ -9,12 +9,44 @@
 """
 
 import time
-from typing import Tuple, Union
+from typing import List, Optional, Tuple, Union
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+# 隐藏页面上的遮罩层
+_JS_REMOVE_OVERLAYS = """
+    var overlays = document.getElementsByClassName('overlay');
+    for (var i = 0; i < overlays.length; i++) {
+        overlays[i].style.visibility = 'hidden';
+    }
+"""
+
+# 滚动到元素中心位置
+_JS_SCROLL = "arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});"
+
+# 依次求值候选XPath，返回第一个存在且可点击（未禁用、已渲染）的[序号, 元素]
+# 用getClientRects判断是否渲染：offsetParent对position:fixed的弹窗按钮恒为null
+_JS_FIRST_CLICKABLE = """
+    var xpaths = arguments[0];
+    for (var i = 0; i < xpaths.length; i++) {
+        var node = document.evaluate(
+            xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (node && !node.disabled && node.getClientRects().length > 0) {
+            return [i, node];
+        }
+    }
+    return null;
+"""
 
 
 class ElementHelper:
@@ -54,29 +86,77 @@ class ElementHelper:
         if timeout is None:
             timeout = self.default_timeout
 
-        wait = WebDriverWait(self.driver, timeout)
-
         # 根据条件选择等待方法
-        if condition == "presence":
-            ec_condition = EC.presence_of_element_located(locator)
-        elif condition == "visible":
+        if condition == "visible":
             ec_condition = EC.visibility_of_element_located(locator)
         elif condition == "clickable":
             ec_condition = EC.element_to_be_clickable(locator)
         else:
-            ec_condition = EC.presence_of_element_located(locator)
+            return self._find_with_implicit_wait(locator, timeout)
+
+        try:
+            return WebDriverWait(self.driver, timeout).until(ec_condition)
+        except TimeoutException:
+            return None
+
+    def _find_with_implicit_wait(self, locator: Tuple, timeout: int) -> Union[WebElement, None]:
+        """
+        使用隐式等待查找元素（在浏览器端轮询，只需一次查找请求）
+
+        隐式等待仅在本次查找期间生效，结束后恢复为0，
+        避免与其他显式等待叠加。
+
+        Args:
+            locator: 元素定位器
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            找到的元素，超时则返回None
+        """
+        self.driver.implicitly_wait(timeout)
+        try:
+            return self.driver.find_element(*locator)
+        except NoSuchElementException:
+            return None
+        finally:
+            self.driver.implicitly_wait(0)
+
+    def first_present(
+        self,
+        xpaths: List[str],
+        timeout: float = 0
+    ) -> Tuple[int, Optional[WebElement]]:
+        """
+        在一次脚本调用中查找第一个可点击的候选元素
+
+        Args:
+            xpaths: 候选XPath列表（按优先级排序）
+            timeout: 等待任一候选可点击的超时时间（秒），0表示只查找一次
+
+        Returns:
+            (候选序号, 元素)，均不可用时返回(-1, None)
+        """
+        if not xpaths:
+            return -1, None
+
+        def probe(driver):
+            return driver.execute_script(_JS_FIRST_CLICKABLE, xpaths)
+
+        if timeout > 0:
+            try:
+                result = WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(probe)
+            except TimeoutException:
+                result = None
+        else:
+            result = probe(self.driver)
 
-        element = wait.until(ec_condition)
-        return element
+        if not result:
+            return -1, None
+        return int(result[0]), result[1]
 
     def remove_overlays(self):
         """移除页面上的遮罩层"""
-        self.driver.execute_script("""
-            var overlays = document.getElementsByClassName('overlay');
-            for(var i=0; i<overlays.length; i++){
-                overlays[i].style.visibility = 'hidden';
-            }
-        """)
+        self.driver.execute_script(_JS_REMOVE_OVERLAYS)
 
     def scroll_to_element(self, element: WebElement):
         """
@@ -85,11 +165,7 @@ class ElementHelper:
         Args:
             element: 目标元素
         """
-        self.driver.execute_script(
-            "arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});",
-            element
-        )
-        time.sleep(0.3)
+        self.driver.execute_script(_JS_SCROLL, element)
 
     def safe_click(
         self,
@@ -100,6 +176,9 @@ class ElementHelper:
         """
         安全点击元素（带重试机制）
 
+        优先使用原生点击（产生可信的用户事件）；被遮挡或不可交互时
+        移除遮罩层并滚动到元素后重试，最后一次重试改用JS点击。
+
         Args:
             element: WebElement实例或定位器元组
             description: 元素描述（用于日志）
@@ -108,22 +187,31 @@ class ElementHelper:
         Returns:
             是否点击成功
         """
-        # 如果传入的是定位器，先等待元素
-        if isinstance(element, tuple):
-            element = self.wait_for_element(element, condition="clickable")
+        # 如果传入的是定位器，先等待元素（元素失效时可据此重新定位）
+        locator = element if isinstance(element, tuple) else None
+        if locator:
+            element = self.wait_for_element(locator, condition="clickable")
             if not element:
                 return False
 
         for attempt in range(retries):
-            # 移除遮罩层
-            self.remove_overlays()
-
-            # 滚动到元素
-            self.scroll_to_element(element)
-
-            # 尝试点击
-            self.driver.execute_script("arguments[0].click();", element)
-            return True
+            try:
+                if attempt > 0 and attempt == retries - 1:
+                    # 最后一次改用JS点击，不受遮挡影响
+                    self.driver.execute_script("arguments[0].click();", element)
+                else:
+                    element.click()
+                return True
+            except (ElementClickInterceptedException, ElementNotInteractableException):
+                # 移除遮罩层并滚动到元素后重试
+                self.remove_overlays()
+                self.scroll_to_element(element)
+            except StaleElementReferenceException:
+                if not locator:
+                    return False
+                element = self.wait_for_element(locator, condition="clickable")
+                if not element:
+                    return False
 
         return False
 
@@ -0,0 +1,27 @@
+"""
+JSON处理工具模块
+
+功能：
+1. 解析JSON（接受str或bytes）
+2. 序列化为UTF-8 bytes
+
+优先使用更快的orjson，未安装时回退到标准库json
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+# JSON解析函数（orjson与json都接受str和bytes）
+json_loads = orjson.loads if orjson else json.loads
+
+
+def json_dumps(data: Any) -> bytes:
+    """序列化为UTF-8 bytes（中文不转义）"""
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
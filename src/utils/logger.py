@@ -5,14 +5,93 @@
 1. 配置日志格式（仅记录ERROR级别）
 2. 保存错误截图和HTML
 3. 支持多账户日志区分
+4. 日志经队列交由后台线程写入，不阻塞预约流程
 """
 
+import asyncio
+import atexit
 import logging
 import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
 from selenium.webdriver.remote.webdriver import WebDriver
 
+# 所有账户共用一个日志队列和后台写入线程，记录日志只需入队
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+# 日志记录器名称 -> 实际写入的处理器（文件、控制台）
+_routes: Dict[str, List[logging.Handler]] = {}
+
+# 所有处理器共用的日志格式
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# 已创建过的目录，避免重复调用makedirs
+_ENSURED_DIRS: Set[str] = set()
+
+# 当天日期字符串（用于日志文件名），每60秒重新计算一次
+_TODAY_REFRESH_SECONDS = 60
+_today = ''
+_today_checked_at = float('-inf')
+
+
+def _today_str() -> str:
+    """获取当天日期字符串（YYYYMMDD）"""
+    global _today, _today_checked_at
+    now = time.monotonic()
+    if now - _today_checked_at >= _TODAY_REFRESH_SECONDS:
+        _today = datetime.now().strftime('%Y%m%d')
+        _today_checked_at = now
+    return _today
+
+
+def _ensure_dir(path: str):
+    """创建目录（同一目录只创建一次）"""
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+class _RouteHandler(logging.Handler):
+    """在后台线程中按日志记录器名称分发到对应账户的处理器"""
+
+    def emit(self, record: logging.LogRecord):
+        for handler in _routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def _ensure_listener():
+    """首次使用时启动后台写入线程（子进程中各自启动）"""
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_log_queue, _RouteHandler())
+            _listener.start()
+            atexit.register(_shutdown)
+
+
+def _shutdown():
+    """停止后台线程（会先处理完队列中的记录），再刷新所有处理器"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handlers in _routes.values():
+        for handler in handlers:
+            handler.flush()
+
 
 class Logger:
     """日志管理器，仅记录失败日志"""
@@ -32,8 +111,8 @@ class Logger:
         self.error_dir = error_dir
 
         # 创建目录
-        os.makedirs(log_dir, exist_ok=True)
-        os.makedirs(error_dir, exist_ok=True)
+        _ensure_dir(log_dir)
+        _ensure_dir(error_dir)
 
         # 配置日志记录器
         self.logger = logging.getLogger(name)
@@ -44,11 +123,13 @@ class Logger:
             # 文件处理器
             log_file = os.path.join(
                 log_dir,
-                f"error_{name}_{datetime.now().strftime('%Y%m%d')}.log"
+                f"error_{name}_{_today_str()}.log"
             )
+            # 延迟到首次写入时才创建文件，没有错误的账户不产生日志文件
             file_handler = logging.FileHandler(
                 log_file,
-                encoding='utf-8'
+                encoding='utf-8',
+                delay=True
             )
             file_handler.setLevel(logging.ERROR)
 
@@ -57,32 +138,28 @@ class Logger:
             console_handler.setLevel(logging.ERROR)
 
             # 日志格式
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            file_handler.setFormatter(formatter)
-            console_handler.setFormatter(formatter)
+            file_handler.setFormatter(_FORMATTER)
+            console_handler.setFormatter(_FORMATTER)
 
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            # 错误日志直接写入文件，超时强制退出（os._exit）时不会丢失；
+            # 实际写入由后台线程完成
+            _routes[name] = [file_handler, console_handler]
+            _ensure_listener()
+            self.logger.addHandler(QueueHandler(_log_queue))
 
     def error(self, message: str):
         """记录错误日志"""
         self.logger.error(message)
 
-    def save_error_screenshot(self, driver: Optional[WebDriver],
-                               error_type: str) -> bool:
-        """
-        保存错误截图和HTML
+    def flush(self):
+        """等待队列中的日志处理完毕，并刷新本账户的处理器"""
+        if _listener is not None:
+            _log_queue.join()
+        for handler in _routes.get(self.name, ()):
+            handler.flush()
 
-        Args:
-            driver: WebDriver实例
-            error_type: 错误类型（用于文件命名）
-
-        Returns:
-            是否保存成功
-        """
+    def _check_driver(self, driver: Optional[WebDriver]) -> bool:
+        """检查driver是否可用于保存截图"""
         if not driver:
             self.error("WebDriver为空，无法保存错误截图")
             return False
@@ -92,30 +169,74 @@ class Logger:
             self.error("WebDriver会话无效，无法保存错误截图")
             return False
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return True
 
-        # 保存截图
-        screenshot_path = os.path.join(
+    def _error_paths(self, error_type: str):
+        """生成错误截图和HTML的保存路径"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(
             self.error_dir,
-            f"error_{error_type}_{self.name}_{timestamp}.png"
+            f"error_{error_type}_{self.name}_{timestamp}"
         )
-        driver.save_screenshot(screenshot_path)
+        return base + ".png", base + ".html"
+
+    @staticmethod
+    def _write_html(driver: WebDriver, html_path: str):
+        """读取页面源码并写入文件"""
+        page_source = driver.page_source
+        # 页面源码通常较大，使用64KB缓冲减少写入次数
+        with open(html_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            f.write(page_source)
+
+    async def save_error_screenshot_async(self, driver: Optional[WebDriver],
+                                          error_type: str) -> bool:
+        """
+        保存错误截图和HTML（异步版本，供已在事件循环中的调用方使用）
 
-        # 保存HTML
-        html_path = os.path.join(
-            self.error_dir,
-            f"error_{error_type}_{self.name}_{timestamp}.html"
+        保存过程在线程池中按顺序执行，不阻塞事件循环，
+        同一WebDriver不会被多个线程同时调用。
+
+        Args:
+            driver: WebDriver实例
+            error_type: 错误类型（用于文件命名）
+
+        Returns:
+            是否保存成功
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.save_error_screenshot, driver, error_type
         )
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+
+    def save_error_screenshot(self, driver: Optional[WebDriver],
+                               error_type: str) -> bool:
+        """
+        保存错误截图和HTML
+
+        Args:
+            driver: WebDriver实例
+            error_type: 错误类型（用于文件命名）
+
+        Returns:
+            是否保存成功
+        """
+        if not self._check_driver(driver):
+            return False
+
+        screenshot_path, html_path = self._error_paths(error_type)
+        driver.save_screenshot(screenshot_path)
+        self._write_html(driver, html_path)
 
         self.error(f"错误信息已保存: {screenshot_path}")
         return True
 
 
+@lru_cache(maxsize=None)
 def get_logger(account_name: str) -> Logger:
     """
-    获取日志记录器
+    获取日志记录器（同一账户返回同一实例）
+
+    日志处理器按名称只配置一次，同名记录器的目录以首次创建时为准。
 
     Args:
         account_name: 账户名称
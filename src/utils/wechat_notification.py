@@ -18,19 +18,140 @@
     await notifier.send_success_notification(seat_number=140, date="2025-09-18")
 """
 
-import json
 import time
+import random
+import socket
 import logging
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Deque, Dict, Any, Optional, List
 import aiohttp
 import asyncio
 
+from .json_helper import json_dumps, json_loads
+
+
+# 企业微信机器人限制每个webhook每分钟最多发送20条消息
+_RATE_LIMIT_PER_MINUTE = 20
+# 企业微信接口频率超限的错误码
+_RATE_LIMIT_ERRCODE = 45009
+# 重试等待的上限(秒)
+_MAX_RETRY_DELAY = 30
+
+# 每个webhook最近一分钟内的发送时间（进程内共享）
+_send_history: Dict[str, Deque[float]] = defaultdict(deque)
+
+
+# 未配置webhook时的返回结果模板（每次返回副本，调用方可自由修改）
+_NOT_CONFIGURED: Dict[str, Any] = {
+    'success': False,
+    'message': '企业微信机器人未配置或配置错误',
+    'error_code': 'NOT_CONFIGURED'
+}
+
+
+def _text_payload(content: str, mention_list: Optional[List[str]],
+                  mention_mobile_list: Optional[List[str]]) -> Dict[str, Any]:
+    """文本消息的消息体（支持@提醒）"""
+    payload: Dict[str, Any] = {"content": content}
+    if mention_list:
+        payload["mentioned_list"] = mention_list
+    if mention_mobile_list:
+        payload["mentioned_mobile_list"] = mention_mobile_list
+    return payload
+
+
+def _markdown_payload(content: str, mention_list: Optional[List[str]],
+                      mention_mobile_list: Optional[List[str]]) -> Dict[str, Any]:
+    """Markdown消息的消息体（不支持@提醒）"""
+    return {"content": content}
+
+
+# 消息类型 -> 消息体构造函数
+_MSGTYPES = {
+    "text": _text_payload,
+    "markdown": _markdown_payload,
+}
+
+# 合并发送时各段通知之间的分隔
+_BATCH_SEPARATOR = "\n\n---\n\n"
+
+# 通知消息模板
+_SUCCESS_TMPL = """🎉 【座位预约成功】🎉
+
+📍 座位信息: {seat_number}号座位
+📅 预约日期: {date}
+🏢 房间: {room_name}
+👤 账户: {account_name}
+⏰ 预约时间: {current_time}
+🎯 尝试次数: {attempts}次
+
+💡 预约系统自动化成功！请及时查看！"""
+
+_FAILURE_TMPL = """❌ 【座位预约失败】❌
+
+📅 目标日期: {date}
+🏢 房间: {room_name}
+👤 账户: {account_name}
+⏰ 执行时间: {current_time}
+🎯 尝试次数: {attempts}次
+{seats_info}
+📋 失败原因: {error_message}
+
+💡 建议检查账户状态和座位可用性！"""
+
+_REPORT_TMPL = """📊 【双账户预约报告】📊
+
+⏰ 执行时间: {current_time}
+⏱️ 总耗时: {execution_time:.1f}秒
+✅ 成功: {successful} 个账户
+❌ 失败: {failed} 个账户
+
+📋 详细结果:
+{result_details}
+
+💡 双账户并行预约{outcome}！请及时查看！"""
+
+_TEST_TMPL = """🧪 【通知测试】🧪
+
+⏰ 测试时间: {test_time}
+🤖 通知服务: 企业微信机器人
+✅ 状态: 配置正常，连接成功！
+
+💡 座位预约系统通知功能已就绪！"""
+
+
+def _now_hms() -> str:
+    """当前时间（时:分:秒），time.strftime比datetime格式化更快"""
+    return time.strftime("%H:%M:%S")
+
+
+def _format_result_line(index: int, result: Dict[str, Any]) -> str:
+    """格式化汇总报告中单个账户的结果行"""
+    account_name = result.get('account_name', f'账户{index+1}')
+    if result.get('success'):
+        return f"✅ {account_name}: 预约成功 - 座位{result.get('seat_number', 'N/A')}"
+    return f"❌ {account_name}: 预约失败 - {result.get('message', '未知错误')}"
+
+
+def _backoff_delay(attempt: int) -> float:
+    """指数退避（带随机抖动）：0.5s、1s、2s……，上限30秒"""
+    return min(_MAX_RETRY_DELAY, 0.5 * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After响应头（秒数），无法解析时返回None"""
+    try:
+        return min(_MAX_RETRY_DELAY, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
 
 class WeChatWorkNotifier:
     """企业微信机器人通知器"""
     
-    def __init__(self, webhook_url: str, timeout: int = 10, max_retries: int = 3):
+    def __init__(self, webhook_url: str, timeout: int = 10, max_retries: int = 3,
+                 max_concurrency: int = 8):
         """
         初始化企业微信通知器
         
@@ -38,23 +159,75 @@ class WeChatWorkNotifier:
             webhook_url: 企业微信机器人Webhook URL
             timeout: 请求超时时间(秒)
             max_retries: 最大重试次数
+            max_concurrency: 同时发送的最大消息数
         """
         self.webhook_url = webhook_url
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        # 待合并发送的通知内容
+        self._pending: List[str] = []
+        self._configured = bool(webhook_url and webhook_url.startswith('https://qyapi.weixin.qq.com'))
+        
+        # 并发发送限制（在事件循环内首次发送时创建，绑定到该循环）
+        self._sem: Optional[asyncio.Semaphore] = None
         self.logger = logging.getLogger(self.__class__.__name__)
         
-        # 发送统计
-        self.stats = {
-            'total_sent': 0,
-            'success_sent': 0,
-            'failed_sent': 0,
-            'last_sent_time': None
-        }
+        # 复用的HTTP会话（首次发送时创建，保持keep-alive连接）
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._json_headers = {"Content-Type": "application/json; charset=utf-8"}
+        
+        # 发送统计（读取时由get_stats组装为字典）
+        self._total = 0
+        self._success = 0
+        self._failed = 0
+        self._last_sent: Optional[float] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取复用的HTTP会话（首次调用或会话已关闭时创建）"""
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            # 只访问企业微信一个主机：缓存DNS解析结果并只用IPv4，
+            # 每主机连接数与并发发送上限一致
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=self.max_concurrency,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                family=socket.AF_INET,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector
+            )
+        return self._session
+    
+    async def aclose(self):
+        """关闭HTTP会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self) -> "WeChatWorkNotifier":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
     
     def is_configured(self) -> bool:
         """检查是否已正确配置"""
-        return bool(self.webhook_url and self.webhook_url.startswith('https://qyapi.weixin.qq.com'))
+        return self._configured
+    
+    def max_send_time(self) -> float:
+        """
+        单条消息发送的最长耗时（秒），供同步调用方设置等待上限
+
+        每次尝试最多等待频率限制60秒和请求超时，
+        两次尝试之间最多等待_MAX_RETRY_DELAY秒。
+        """
+        return ((60 + self.timeout) * self.max_retries
+                + _MAX_RETRY_DELAY * (self.max_retries - 1))
     
     async def send_text_message(self, content: str, mention_list: List[str] = None, 
                                mention_mobile_list: List[str] = None) -> Dict[str, Any]:
@@ -69,29 +242,7 @@ class WeChatWorkNotifier:
         Returns:
             发送结果字典
         """
-        if not self.is_configured():
-            return {
-                'success': False,
-                'message': '企业微信机器人未配置或配置错误',
-                'error_code': 'NOT_CONFIGURED'
-            }
-        
-        # 构造消息体
-        message_data = {
-            "msgtype": "text",
-            "text": {
-                "content": content
-            }
-        }
-        
-        # 添加@提醒
-        if mention_list:
-            message_data["text"]["mentioned_list"] = mention_list
-        
-        if mention_mobile_list:
-            message_data["text"]["mentioned_mobile_list"] = mention_mobile_list
-        
-        return await self._send_message(message_data)
+        return await self._send_typed("text", content, mention_list, mention_mobile_list)
     
     async def send_markdown_message(self, content: str) -> Dict[str, Any]:
         """
@@ -103,20 +254,28 @@ class WeChatWorkNotifier:
         Returns:
             发送结果字典
         """
-        if not self.is_configured():
-            return {
-                'success': False,
-                'message': '企业微信机器人未配置或配置错误',
-                'error_code': 'NOT_CONFIGURED'
-            }
-        
-        message_data = {
-            "msgtype": "markdown",
-            "markdown": {
-                "content": content
-            }
-        }
+        return await self._send_typed("markdown", content)
+    
+    async def _send_typed(self, msgtype: str, content: str,
+                          mention_list: List[str] = None,
+                          mention_mobile_list: List[str] = None) -> Dict[str, Any]:
+        """
+        按消息类型构造消息体并发送
         
+        Args:
+            msgtype: 消息类型（text/markdown）
+            content: 消息内容
+            mention_list: @用户列表（仅文本消息）
+            mention_mobile_list: @用户手机号列表（仅文本消息）
+            
+        Returns:
+            发送结果字典
+        """
+        if not self._configured:
+            return dict(_NOT_CONFIGURED)
+        
+        message_data = {"msgtype": msgtype}
+        message_data[msgtype] = _MSGTYPES[msgtype](content, mention_list, mention_mobile_list)
         return await self._send_message(message_data)
     
     async def _send_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -129,64 +288,116 @@ class WeChatWorkNotifier:
         Returns:
             发送结果字典
         """
-        self.stats['total_sent'] += 1
+        self._total += 1
+        
+        # 消息体只序列化一次，重试时直接复用
+        body = json_dumps(message_data)
+        
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
         
+        async with self._sem:
+            result = await self._send_with_retry(body)
+        
+        # 记录发送时间（只在消息发送结束时记录一次，读取统计时再转换为datetime）
+        self._last_sent = time.time()
+        return result
+    
+    async def _wait_rate_limit(self):
+        """发送前检查频率限制，最近一分钟已达上限时等待最早的记录过期"""
+        history = _send_history[self.webhook_url]
+        while True:
+            now = time.monotonic()
+            while history and now - history[0] >= 60:
+                history.popleft()
+            if len(history) < _RATE_LIMIT_PER_MINUTE:
+                history.append(now)
+                return
+            await asyncio.sleep(60 - (now - history[0]))
+    
+    async def _send_with_retry(self, body: bytes) -> Dict[str, Any]:
+        """
+        发送已序列化的消息，失败时重试
+        
+        Args:
+            body: JSON格式的消息体
+            
+        Returns:
+            发送结果字典
+        """
         for attempt in range(1, self.max_retries + 1):
+            # 服务端要求的等待时间（频率超限时）
+            retry_after = None
             try:
                 self.logger.debug(f"发送企业微信消息 (尝试 {attempt}/{self.max_retries})")
                 
-                timeout = aiohttp.ClientTimeout(total=self.timeout)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.post(self.webhook_url, json=message_data) as response:
-                        
-                        # 记录发送时间
-                        self.stats['last_sent_time'] = datetime.now()
+                await self._wait_rate_limit()
+                session = await self._get_session()
+                async with session.post(self.webhook_url, data=body, headers=self._json_headers) as response:
+                    
+                    if response.status == 200:
+                        result = await response.json(loads=json_loads)
                         
-                        if response.status == 200:
-                            result = await response.json()
+                        if result.get('errcode') == 0:
+                            self._success += 1
+                            self.logger.info("企业微信消息发送成功")
+                            return {
+                                'success': True,
+                                'message': '消息发送成功',
+                                'response': result,
+                                'attempt': attempt
+                            }
+                        else:
+                            error_msg = result.get('errmsg', '未知错误')
+                            self.logger.warning(f"企业微信API返回错误: {error_msg}")
                             
-                            if result.get('errcode') == 0:
-                                self.stats['success_sent'] += 1
-                                self.logger.info("企业微信消息发送成功")
+                            # 某些错误不需要重试
+                            if result.get('errcode') in [93000, 93004]:
+                                self._failed += 1
                                 return {
-                                    'success': True,
-                                    'message': '消息发送成功',
-                                    'response': result,
-                                    'attempt': attempt
+                                    'success': False,
+                                    'message': f'企业微信API错误: {error_msg}',
+                                    'error_code': result.get('errcode'),
+                                    'retry': False
                                 }
-                            else:
-                                error_msg = result.get('errmsg', '未知错误')
-                                self.logger.warning(f"企业微信API返回错误: {error_msg}")
-                                
-                                # 某些错误不需要重试
-                                if result.get('errcode') in [93000, 93004]:
-                                    self.stats['failed_sent'] += 1
-                                    return {
-                                        'success': False,
-                                        'message': f'企业微信API错误: {error_msg}',
-                                        'error_code': result.get('errcode'),
-                                        'retry': False
-                                    }
-                        else:
-                            self.logger.warning(f"HTTP请求失败: {response.status}")
+                            
+                            if result.get('errcode') == _RATE_LIMIT_ERRCODE:
+                                retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                    else:
+                        self.logger.warning(f"HTTP请求失败: {response.status}")
+                        if response.status == 429:
+                            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
                 
             except asyncio.TimeoutError:
                 self.logger.warning(f"企业微信消息发送超时 (尝试 {attempt}/{self.max_retries})")
             except Exception as e:
                 self.logger.error(f"企业微信消息发送异常: {e} (尝试 {attempt}/{self.max_retries})")
             
-            # 重试延迟
+            # 重试延迟：优先遵循服务端的Retry-After，否则指数退避
             if attempt < self.max_retries:
-                await asyncio.sleep(1)
+                await asyncio.sleep(retry_after if retry_after is not None else _backoff_delay(attempt))
         
         # 所有重试失败
-        self.stats['failed_sent'] += 1
+        self._failed += 1
         return {
             'success': False,
             'message': f'企业微信消息发送失败，已重试{self.max_retries}次',
             'error_code': 'SEND_FAILED'
         }
     
+    def format_success_notification(self, seat_number: int, date: str,
+                                    account_name: str = "", attempts: int = 1,
+                                    room_name: str = "立德研学中心") -> str:
+        """构造预约成功通知的内容（参数同send_success_notification）"""
+        return _SUCCESS_TMPL.format_map({
+            'seat_number': seat_number,
+            'date': date,
+            'room_name': room_name,
+            'account_name': account_name,
+            'current_time': _now_hms(),
+            'attempts': attempts
+        })
+    
     async def send_success_notification(self, seat_number: int, date: str, 
                                       account_name: str = "", attempts: int = 1, 
                                       room_name: str = "立德研学中心", 
@@ -205,23 +416,30 @@ class WeChatWorkNotifier:
         Returns:
             发送结果
         """
-        current_time = datetime.now().strftime("%H:%M:%S")
-        
-        # 构造消息内容
-        content = f"""🎉 【座位预约成功】🎉
-
-📍 座位信息: {seat_number}号座位
-📅 预约日期: {date}
-🏢 房间: {room_name}
-👤 账户: {account_name}
-⏰ 预约时间: {current_time}
-🎯 尝试次数: {attempts}次
-
-💡 预约系统自动化成功！请及时查看！"""
+        content = self.format_success_notification(
+            seat_number, date, account_name, attempts, room_name
+        )
         
         mention_list = ["@all"] if mention_all else None
         return await self.send_text_message(content, mention_list=mention_list)
     
+    def format_failure_notification(self, date: str, account_name: str = "",
+                                    attempts: int = 1, error_message: str = "",
+                                    room_name: str = "立德研学中心",
+                                    attempted_seats: List[int] = None) -> str:
+        """构造预约失败通知的内容（参数同send_failure_notification）"""
+        seats_info = f"📋 尝试座位: {attempted_seats}" if attempted_seats else ""
+        
+        return _FAILURE_TMPL.format_map({
+            'date': date,
+            'room_name': room_name,
+            'account_name': account_name,
+            'current_time': _now_hms(),
+            'attempts': attempts,
+            'seats_info': seats_info,
+            'error_message': error_message
+        })
+    
     async def send_failure_notification(self, date: str, account_name: str = "", 
                                       attempts: int = 1, error_message: str = "",
                                       room_name: str = "立德研学中心",
@@ -242,24 +460,30 @@ class WeChatWorkNotifier:
         Returns:
             发送结果
         """
-        current_time = datetime.now().strftime("%H:%M:%S")
-        seats_info = f"📋 尝试座位: {attempted_seats}" if attempted_seats else ""
-        
-        content = f"""❌ 【座位预约失败】❌
-
-📅 目标日期: {date}
-🏢 房间: {room_name}
-👤 账户: {account_name}
-⏰ 执行时间: {current_time}
-🎯 尝试次数: {attempts}次
-{seats_info}
-📋 失败原因: {error_message}
-
-💡 建议检查账户状态和座位可用性！"""
+        content = self.format_failure_notification(
+            date, account_name, attempts, error_message, room_name, attempted_seats
+        )
         
         mention_list = ["@all"] if mention_all else None
         return await self.send_text_message(content, mention_list=mention_list)
     
+    def format_dual_account_report(self, successful: int, failed: int,
+                                   execution_time: float, results: List[Dict]) -> str:
+        """构造双账户执行报告的内容（参数同send_dual_account_report）"""
+        # 构造结果详情
+        result_details = "\n".join([
+            _format_result_line(i, result) for i, result in enumerate(results)
+        ])
+        
+        return _REPORT_TMPL.format_map({
+            'current_time': _now_hms(),
+            'execution_time': execution_time,
+            'successful': successful,
+            'failed': failed,
+            'result_details': result_details,
+            'outcome': "成功" if successful > 0 else "失败"
+        })
+    
     async def send_dual_account_report(self, successful: int, failed: int, 
                                      execution_time: float, results: List[Dict],
                                      mention_all: bool = False) -> Dict[str, Any]:
@@ -276,34 +500,42 @@ class WeChatWorkNotifier:
         Returns:
             发送结果
         """
-        current_time = datetime.now().strftime("%H:%M:%S")
-        
-        # 构造结果详情
-        result_details = []
-        for i, result in enumerate(results):
-            account_name = result.get('account_name', f'账户{i+1}')
-            if result.get('success'):
-                seat_number = result.get('seat_number', 'N/A')
-                result_details.append(f"✅ {account_name}: 预约成功 - 座位{seat_number}")
-            else:
-                message = result.get('message', '未知错误')
-                result_details.append(f"❌ {account_name}: 预约失败 - {message}")
-        
-        content = f"""📊 【双账户预约报告】📊
-
-⏰ 执行时间: {current_time}
-⏱️ 总耗时: {execution_time:.1f}秒
-✅ 成功: {successful} 个账户
-❌ 失败: {failed} 个账户
-
-📋 详细结果:
-{chr(10).join(result_details)}
-
-💡 双账户并行预约{"成功" if successful > 0 else "失败"}！请及时查看！"""
+        content = self.format_dual_account_report(
+            successful, failed, execution_time, results
+        )
         
         mention_list = ["@all"] if mention_all else None
         return await self.send_text_message(content, mention_list=mention_list)
     
+    async def queue(self, section: str):
+        """
+        暂存一段通知内容，稍后由flush_batched合并发送
+        
+        Args:
+            section: 通知内容
+        """
+        self._pending.append(section)
+    
+    async def flush_batched(self, mention_all: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        将暂存的通知合并为一条Markdown消息发送
+        
+        Args:
+            mention_all: 是否@所有人（Markdown消息不支持@，此时改用文本消息发送）
+            
+        Returns:
+            发送结果，没有暂存内容时返回None
+        """
+        if not self._pending:
+            return None
+        
+        content = _BATCH_SEPARATOR.join(self._pending)
+        self._pending = []
+        
+        if mention_all:
+            return await self.send_text_message(content, mention_list=["@all"])
+        return await self.send_markdown_message(content)
+    
     async def send_test_message(self) -> Dict[str, Any]:
         """
         发送测试消息
@@ -311,35 +543,28 @@ class WeChatWorkNotifier:
         Returns:
             发送结果
         """
-        test_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        content = f"""🧪 【通知测试】🧪
-
-⏰ 测试时间: {test_time}
-🤖 通知服务: 企业微信机器人
-✅ 状态: 配置正常，连接成功！
-
-💡 座位预约系统通知功能已就绪！"""
+        test_time = time.strftime("%Y-%m-%d %H:%M:%S")
+        content = _TEST_TMPL.format_map({'test_time': test_time})
         
         return await self.send_text_message(content)
     
     def get_stats(self) -> Dict[str, Any]:
         """获取发送统计信息"""
-        stats = self.stats.copy()
-        if stats['total_sent'] > 0:
-            stats['success_rate'] = stats['success_sent'] / stats['total_sent']
-        else:
-            stats['success_rate'] = 0.0
-        
-        return stats
+        return {
+            'total_sent': self._total,
+            'success_sent': self._success,
+            'failed_sent': self._failed,
+            'last_sent_time': datetime.fromtimestamp(self._last_sent) if self._last_sent is not None else None,
+            # 未发送时分母取1，成功率为0
+            'success_rate': self._success / (self._total or 1)
+        }
     
     def reset_stats(self):
         """重置统计信息"""
-        self.stats = {
-            'total_sent': 0,
-            'success_sent': 0,
-            'failed_sent': 0,
-            'last_sent_time': None
-        }
+        self._total = 0
+        self._success = 0
+        self._failed = 0
+        self._last_sent = None
 
 
 # 便捷函数
@@ -356,9 +581,9 @@ async def send_wechat_notification(webhook_url: str, message: str,
     Returns:
         发送结果
     """
-    notifier = WeChatWorkNotifier(webhook_url)
     mention_list = ["@all"] if mention_all else None
-    return await notifier.send_text_message(message, mention_list=mention_list)
+    async with WeChatWorkNotifier(webhook_url) as notifier:
+        return await notifier.send_text_message(message, mention_list=mention_list)
 
 
 async def test_wechat_configuration(webhook_url: str) -> Dict[str, Any]:
@@ -371,8 +596,8 @@ async def test_wechat_configuration(webhook_url: str) -> Dict[str, Any]:
     Returns:
         测试结果
     """
-    notifier = WeChatWorkNotifier(webhook_url)
-    return await notifier.send_test_message()
+    async with WeChatWorkNotifier(webhook_url) as notifier:
+        return await notifier.send_test_message()
 
 
 if __name__ == "__main__":
@@ -387,14 +612,13 @@ if __name__ == "__main__":
             print("❌ 请先配置正确的Webhook URL")
             return
         
-        notifier = WeChatWorkNotifier(webhook_url)
-        
-        print(f"配置状态: {'✅ 已配置' if notifier.is_configured() else '❌ 未配置'}")
-        
-        if notifier.is_configured():
-            result = await notifier.send_test_message()
-            print(f"测试结果: {result}")
-            print(f"发送统计: {notifier.get_stats()}")
+        async with WeChatWorkNotifier(webhook_url) as notifier:
+            print(f"配置状态: {'✅ 已配置' if notifier.is_configured() else '❌ 未配置'}")
+            
+            if notifier.is_configured():
+                result = await notifier.send_test_message()
+                print(f"测试结果: {result}")
+                print(f"发送统计: {notifier.get_stats()}")
     
     asyncio.run(test_notification())
 
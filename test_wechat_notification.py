@@ -109,6 +109,8 @@ async def test_wechat_notification():
         print(f"   ❌ 双账户报告发送失败: {result['message']}")
     print()
     
+    await notifier.aclose()
+    
     # 显示统计信息
     stats = notifier.get_stats()
     print("=" * 60)